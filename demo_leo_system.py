@@ -5,13 +5,29 @@ This demonstrates the full autonomous development workflow
 """
 
 import sys
-import time
+import asyncio
 import json
 from pathlib import Path
 
 # Setup path
 sys.path.append('src')
 
+# Invariant escalation-demo fixtures, frozen once at module load so a
+# stress loop over escalations doesn't reallocate them per call
+DEMO_ERROR_MESSAGES = (
+    "ModuleNotFoundError: No module named 'jwt'",
+    "ImportError: cannot import name 'JWTError'",
+    "AttributeError: 'NoneType' object has no attribute 'decode'"
+)
+DEMO_RECENT_COMMANDS = (
+    "pip install pyjwt",
+    "from jwt import decode",
+    "python test_auth.py"
+)
+DEMO_MODIFIED_FILES = ("src/auth.py", "tests/test_auth.py")
+DEMO_PROJECT_GOALS = ("implement secure authentication", "add user management")
+DEMO_RESOLUTION_ATTEMPTS = ("pip install different jwt library", "check import syntax")
+
 def demo_leo_monitoring():
     """Demonstrate LEO monitoring Claude Code interactions"""
     
@@ -73,25 +89,32 @@ def demo_leo_monitoring():
         }
     ]
     
-    interaction_ids = []
-    
-    for i, scenario in enumerate(scenarios, 1):
+    # The scenarios are independent LLM-bound calls: run them through a
+    # small worker pool instead of pacing them with sleep(0.5) each
+    async def run_scenarios():
+        sem = asyncio.Semaphore(3)  # don't oversubscribe local LM Studio
+
+        async def one(scenario):
+            async with sem:
+                await asyncio.sleep(0.05)  # stagger submissions slightly
+                return await asyncio.to_thread(
+                    leo_manager.monitor_claude_interaction,
+                    command=scenario['command'],
+                    output=scenario['output'],
+                    files_modified=scenario['files_modified'],
+                    success=scenario['success'],
+                    context=scenario['context']
+                )
+
+        # gather preserves scenario order in its results
+        return await asyncio.gather(*[one(s) for s in scenarios])
+
+    interaction_ids = list(asyncio.run(run_scenarios()))
+
+    for i, (scenario, interaction_id) in enumerate(zip(scenarios, interaction_ids), 1):
         print(f"\n📋 Scenario {i}: {scenario['name']}")
         print(f"   Command: {scenario['command']}")
-        
-        interaction_id = leo_manager.monitor_claude_interaction(
-            command=scenario['command'],
-            output=scenario['output'],
-            files_modified=scenario['files_modified'],
-            success=scenario['success'],
-            context=scenario['context']
-        )
-        
-        interaction_ids.append(interaction_id)
         print(f"   ✅ Monitored with ID: {interaction_id}")
-        
-        # Add small delay to simulate real development
-        time.sleep(0.5)
     
     return interaction_ids
 
@@ -140,7 +163,9 @@ def demo_system_status():
     status = leo_manager.get_system_status()
     
     print("🖥️  LEO System Status:")
-    print(json.dumps(status, indent=2))
+    # ensure_ascii=False skips the per-character escape pass, and explicit
+    # separators avoid the default's trailing-space handling
+    print(json.dumps(status, indent=2, separators=(',', ': '), ensure_ascii=False))
     
     return status
 
@@ -204,24 +229,16 @@ def demo_escalation_scenario():
         description="Claude Code stuck on authentication implementation after 5 failed attempts",
         current_task="implement JWT authentication",
         failed_attempts=5,
-        error_messages=[
-            "ModuleNotFoundError: No module named 'jwt'",
-            "ImportError: cannot import name 'JWTError'",
-            "AttributeError: 'NoneType' object has no attribute 'decode'"
-        ],
-        recent_commands=[
-            "pip install pyjwt",
-            "from jwt import decode",
-            "python test_auth.py"
-        ],
-        modified_files=["src/auth.py", "tests/test_auth.py"],
-        project_goals=["implement secure authentication", "add user management"],
+        error_messages=DEMO_ERROR_MESSAGES,
+        recent_commands=DEMO_RECENT_COMMANDS,
+        modified_files=DEMO_MODIFIED_FILES,
+        project_goals=DEMO_PROJECT_GOALS,
         time_spent=timedelta(minutes=45),
         completion_percentage=30.0,
         system_state={"cpu": "normal", "memory": "normal"},
         resource_usage={"disk": "85%", "network": "active"},
-        previous_escalations=[],
-        resolution_attempts=["pip install different jwt library", "check import syntax"]
+        previous_escalations=(),
+        resolution_attempts=DEMO_RESOLUTION_ATTEMPTS
     )
     
     if leo_manager.escalation_system:
@@ -39,12 +39,41 @@ logging.basicConfig(
 )
 
 app = Flask(__name__)
+
+# Trim jsonify overhead on the hot LEO/LLM endpoints: skip key sorting
+# and pretty-printing so encoding is a single compact pass. (orjson and
+# ujson are not project dependencies, so tune the stdlib encoder.)
+try:
+    app.json.sort_keys = False
+    app.json.compact = True
+except AttributeError:  # Flask < 2.3 uses config-based JSON settings
+    app.config['JSON_SORT_KEYS'] = False
+    app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+
 llm_manager = LLMManager()
 chat_manager = ChatHistoryManager()
 
 # Global to track terminal process
 terminal_process = None
 
+# TTL cache for the polled LEO endpoints: dashboards hit /api/leo/status
+# and /api/leo/activity every second or two from every open tab, so
+# recompute the underlying aggregation at most once per TTL window
+_leo_cache = {}
+_leo_cache_lock = threading.Lock()
+
+def _leo_cached(key, ttl, compute):
+    """Return a cached value for key, recomputing when older than ttl"""
+    now = time.monotonic()
+    with _leo_cache_lock:
+        hit = _leo_cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+    value = compute()
+    with _leo_cache_lock:
+        _leo_cache[key] = (now, value)
+    return value
+
 def initialize_leo_system():
     """Initialize LEO supervisor system"""
     if LEO_AVAILABLE:
@@ -93,14 +122,16 @@ def search_history():
     """API endpoint to search conversation history"""
     query = request.args.get('q', '')
     results = chat_manager.search_conversations(query)
-    return jsonify(results)
+    # ConvRow keeps metadata lazy for in-process callers; the API
+    # response needs the decoded dict shape
+    return jsonify([row.to_dict() for row in results])
 
 # LEO Integration API endpoints
 @app.route('/api/leo/status')
 def leo_status():
     """Get LEO system status"""
     if LEO_AVAILABLE:
-        return jsonify(leo_manager.get_system_status())
+        return jsonify(_leo_cached('status', 0.5, leo_manager.get_system_status))
     else:
         return jsonify({"error": "LEO not available"})
 
@@ -110,10 +141,10 @@ def leo_activity():
     if LEO_AVAILABLE:
         try:
             from src.leodock.leo_dashboard import leo_activity as activity_logger, leo_status as status_tracker
-            return jsonify({
+            return jsonify(_leo_cached('activity', 1.0, lambda: {
                 "recent_activities": activity_logger.get_recent_activities(limit=20),
                 "current_status": status_tracker.get_status_summary()
-            })
+            }))
         except ImportError:
             return jsonify({"error": "LEO dashboard not available"})
     else:
@@ -197,10 +228,7 @@ if __name__ == '__main__':
     print("📺 Starting terminal server...")
     terminal_thread = threading.Thread(target=start_terminal_server, daemon=True)
     terminal_thread.start()
-    
-    # Wait for terminal to start
-    time.sleep(3)
-    
+
     # Start main dashboard
     print("🚀 Starting dashboard on http://localhost:5001")
     print("📺 Terminal available on http://localhost:5000")
@@ -209,8 +237,16 @@ if __name__ == '__main__':
         print("🤖 LEO supervisor monitoring enabled")
         print("🔗 LEO API available at /api/leo/*")
     
-    # Open browser automatically
-    webbrowser.open('http://localhost:5001')
-    
-    # Run dashboard server
-    app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
+    # Open browser automatically once the servers have had a moment to
+    # bind - scheduled on a timer so the dashboard starts listening
+    # immediately instead of sleeping 3s with the port still closed
+    threading.Timer(3.0, webbrowser.open, args=('http://localhost:5001',)).start()
+
+    # Run dashboard server. threaded=True gives each request its own
+    # worker thread, so concurrent /api/llm/send calls overlap instead
+    # of queueing behind one another on a single-threaded dev server.
+    # Debug mode (and the reloader's double-import of LEO init) is
+    # opt-in via LEODOCK_DEBUG=1; production startup stays single-fork.
+    debug = os.environ.get('LEODOCK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(host='0.0.0.0', port=5001, debug=debug,
+            use_reloader=debug, threaded=True)
\ No newline at end of file
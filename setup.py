@@ -12,7 +12,6 @@ from pathlib import Path  # noqa E402
 from typing import List  # noqa E402
 import ast  # noqa E402
 import re  # noqa E402
-import distutils.text_file
 
 CURDIR = Path(__file__).parent
 
@@ -54,9 +53,11 @@ setup(
     extras_require={},
     zip_safe=False,
     python_requires=">=3.6",
-    install_requires=distutils.text_file.TextFile(
-        filename="./requirements.txt"
-    ).readlines(),
+    install_requires=[
+        line.strip()
+        for line in (CURDIR / "requirements.txt").read_text().splitlines()
+        if line.strip() and not line.startswith("#")
+    ],
     classifiers=[
         "Operating System :: OS Independent",
         "License :: OSI Approved :: MIT License",
@@ -1,24 +1,133 @@
 import sqlite3
 import json
-import requests
-import numpy as np
+import hashlib
+import threading
 from datetime import datetime
-from sklearn.metrics.pairwise import cosine_similarity
 import sys
 import os
 
+# numpy/numba are imported lazily so the bare CLI (usage banner, no args)
+# starts without paying for the numeric stack
+np = None
+NUMBA_AVAILABLE = False
+_scan_int8 = None
+
+
+def _load_numeric_stack():
+    """Import numpy and compile the optional numba scan kernel on first use"""
+    global np, NUMBA_AVAILABLE, _scan_int8
+    if np is not None:
+        return
+    import numpy
+    np = numpy
+
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _kernel(matrix, query, out):
+        # Parallel dot-product scan; fastmath lets LLVM vectorize the
+        # inner loop, prange spreads rows across cores
+        for i in prange(matrix.shape[0]):
+            acc = 0.0
+            for j in range(matrix.shape[1]):
+                acc += matrix[i, j] * query[j]
+            out[i] = acc
+
+    _scan_int8 = _kernel
+    NUMBA_AVAILABLE = True
+
+
 class AdvancedChatHistory:
+    EMBED_DIM = 768  # nomic-embed-text-v1.5
+    EMBED_MODEL = "text-embedding-nomic-embed-text-v1.5-embedding"
+    EMBED_CACHE_SIZE = 256  # hottest entries kept in-process
+
+    # Hot-path SQL kept as stable class-level constants so the sqlite3
+    # per-connection statement cache reuses the prepared statements
+    _SQL_INSERT_CONVERSATION = '''
+        INSERT INTO conversations
+        (timestamp, session_id, participant, message, embedding_int8, embedding_scale, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    _SQL_INSERT_VEC = 'INSERT INTO vec_conversations(rowid, embedding) VALUES (?, ?)'
+    _SQL_SELECT_EMBEDDINGS = '''
+        SELECT id, embedding_int8, embedding_scale, embedding_blob, embedding_vector
+        FROM conversations
+        WHERE embedding_int8 IS NOT NULL
+           OR embedding_blob IS NOT NULL
+           OR embedding_vector IS NOT NULL
+        ORDER BY id
+    '''
+
     def __init__(self, db_path="data/leodock_conversations.db"):
+        _load_numeric_stack()
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+
         self.db_path = db_path
+        self.emb_path = db_path + '.emb'  # append-only embedding sidecar
         self.base_url = "http://127.0.0.1:1234/v1"
+        # Pooled keep-alive session: no TCP handshake per embedding call
+        self._http = requests.Session()
+        self._http.mount("http://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
+        self._http.headers['Connection'] = 'keep-alive'
+        self.use_vec_index = os.environ.get('LEODOCK_USE_VEC_INDEX', '').lower() in ('1', 'true', 'yes')
+        self.vec_available = False
+        self._embed_cache = {}  # digest -> embedding list
+        self._conn = None
+        self._lock = threading.Lock()  # serializes writes on the shared connection
+        # In-memory embedding matrix (int8, doubling capacity) so repeated
+        # searches skip the BLOB re-reads; validated via PRAGMA data_version
+        self._mat = None
+        self._mat_ids = None
+        self._mat_scales = None
+        self._mat_count = 0
+        self._mat_version = None
         self.init_database()
-    
+
+    def _connect(self):
+        """Return the shared database connection, opening it on first use"""
+        if self._conn is not None:
+            return self._conn
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.use_vec_index:
+            try:
+                conn.enable_load_extension(True)
+                conn.load_extension("vec0")
+                conn.enable_load_extension(False)
+                self.vec_available = True
+            except (AttributeError, sqlite3.OperationalError):
+                self.vec_available = False
+
+        # WAL lets readers overlap writers; the remaining pragmas trade a
+        # little durability for far fewer fsyncs and page-cache rebuilds
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+
+        self._conn = conn
+        return conn
+
+    def close(self):
+        """Close the shared database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
     def init_database(self):
         """Enhanced database with embeddings"""
         # Ensure data directory exists
         os.makedirs("data", exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
+
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -29,10 +138,22 @@ class AdvancedChatHistory:
                 participant TEXT,
                 message TEXT NOT NULL,
                 embedding_vector TEXT,
+                embedding_blob BLOB,
+                embedding_int8 BLOB,
+                embedding_scale REAL,
                 metadata TEXT,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+
+        # Older databases predate the BLOB/quantized columns - add them in place
+        cursor.execute('PRAGMA table_info(conversations)')
+        columns = [row[1] for row in cursor.fetchall()]
+        if 'embedding_blob' not in columns:
+            cursor.execute('ALTER TABLE conversations ADD COLUMN embedding_blob BLOB')
+        if 'embedding_int8' not in columns:
+            cursor.execute('ALTER TABLE conversations ADD COLUMN embedding_int8 BLOB')
+            cursor.execute('ALTER TABLE conversations ADD COLUMN embedding_scale REAL')
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS llm_sessions (
@@ -51,9 +172,65 @@ class AdvancedChatHistory:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_participant ON conversations(participant)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_id ON conversations(session_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON conversations(timestamp)')
-        
+
+        # Persistent embedding cache so identical texts hit LM Studio once
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                hash BLOB PRIMARY KEY,
+                model TEXT,
+                vec BLOB
+            )
+        ''')
+
+        # FTS5 mirror of conversations for indexed keyword search
+        self.fts_available = False
+        # 'rebuild' re-tokenizes the whole table - only pay for it the
+        # one time the FTS table comes into existence
+        fts_is_new = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='conv_fts'"
+        ).fetchone() is None
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS conv_fts
+                USING fts5(message, participant, content='conversations', content_rowid='id')
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conv_fts_ai AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conv_fts(rowid, message, participant)
+                    VALUES (new.id, new.message, new.participant);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conv_fts_ad AFTER DELETE ON conversations BEGIN
+                    INSERT INTO conv_fts(conv_fts, rowid, message, participant)
+                    VALUES ('delete', old.id, old.message, old.participant);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conv_fts_au AFTER UPDATE OF message, participant ON conversations BEGIN
+                    INSERT INTO conv_fts(conv_fts, rowid, message, participant)
+                    VALUES ('delete', old.id, old.message, old.participant);
+                    INSERT INTO conv_fts(rowid, message, participant)
+                    VALUES (new.id, new.message, new.participant);
+                END
+            ''')
+            # Backfill rows that predate the FTS table, once; the
+            # triggers keep it current from here on
+            if fts_is_new:
+                cursor.execute("INSERT INTO conv_fts(conv_fts) VALUES ('rebuild')")
+            self.fts_available = True
+        except sqlite3.OperationalError:
+            pass  # SQLite built without FTS5 - LIKE fallback still works
+
+        # Optional sqlite-vec KNN index (LEODOCK_USE_VEC_INDEX=1)
+        if self.vec_available:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS vec_conversations
+                USING vec0(embedding FLOAT[{self.EMBED_DIM}])
+            ''')
+            print("⚡ sqlite-vec KNN index enabled")
+
         conn.commit()
-        conn.close()
         print("📊 Advanced chat history database initialized!")
     
     def save_conversation(self, participant, message, session_id=None, metadata=None):
@@ -62,50 +239,105 @@ class AdvancedChatHistory:
         
         # Get embedding from Archie
         embedding = self._get_embedding(message)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO conversations 
-            (timestamp, session_id, participant, message, embedding_vector, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            datetime.now().isoformat(),
-            session_id,
-            participant,
-            message,
-            json.dumps(embedding) if embedding else None,
-            json.dumps(metadata) if metadata else None
-        ))
-        
-        conversation_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            int8_blob, scale = self._quantize_embedding(embedding)
+            cursor.execute(self._SQL_INSERT_CONVERSATION, (
+                datetime.now().isoformat(),
+                session_id,
+                participant,
+                message,
+                int8_blob,
+                scale,
+                json.dumps(metadata) if metadata else None
+            ))
+
+            conversation_id = cursor.lastrowid
+            self._append_matrix(conversation_id, int8_blob, scale)
+
+            # Dual-write into the KNN index so MATCH queries stay in sync
+            if self.vec_available and embedding:
+                try:
+                    cursor.execute(self._SQL_INSERT_VEC,
+                        (conversation_id, self._encode_embedding(embedding)))
+                except sqlite3.OperationalError as e:
+                    print(f"⚠️ Could not update vec index: {e}")
+
+            conn.commit()
+
         print(f"✅ Saved conversation {conversation_id}: {participant} → {message[:50]}...")
         return conversation_id
     
+    def save_conversations_bulk(self, rows, session_id=None):
+        """Save several (participant, message) pairs with one batched embedding call"""
+        rows = list(rows)
+        if not rows:
+            return []
+
+        print(f"💾 Saving {len(rows)} conversations in bulk...")
+        embeddings = self._get_embeddings_batch([message for _, message in rows])
+
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            # One explicit transaction amortizes the fsync across all rows
+            cursor.execute('BEGIN IMMEDIATE')
+
+            conversation_ids = []
+            timestamp = datetime.now().isoformat()
+            for (participant, message), embedding in zip(rows, embeddings):
+                int8_blob, scale = self._quantize_embedding(embedding)
+                cursor.execute(self._SQL_INSERT_CONVERSATION, (
+                    timestamp,
+                    session_id,
+                    participant,
+                    message,
+                    int8_blob,
+                    scale,
+                    None
+                ))
+                conversation_id = cursor.lastrowid
+                conversation_ids.append(conversation_id)
+                self._append_matrix(conversation_id, int8_blob, scale)
+
+                if self.vec_available and embedding:
+                    try:
+                        cursor.execute(
+                            'INSERT INTO vec_conversations(rowid, embedding) VALUES (?, ?)',
+                            (conversation_id, self._encode_embedding(embedding))
+                        )
+                    except sqlite3.OperationalError as e:
+                        print(f"⚠️ Could not update vec index: {e}")
+
+            conn.commit()
+
+        print(f"✅ Saved {len(conversation_ids)} conversations in one batch")
+        return conversation_ids
+
     def save_session(self, session_id, session_type, participants, topic, status='active'):
         """Save LLM session metadata"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO llm_sessions 
-            (session_id, session_type, participants, topic, start_time, status)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            session_id,
-            session_type,
-            json.dumps(participants) if isinstance(participants, list) else participants,
-            topic,
-            datetime.now().isoformat(),
-            status
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO llm_sessions
+                (session_id, session_type, participants, topic, start_time, status)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                session_id,
+                session_type,
+                json.dumps(participants) if isinstance(participants, list) else participants,
+                topic,
+                datetime.now().isoformat(),
+                status
+            ))
+
+            conn.commit()
         print(f"📋 Saved session: {session_id} ({session_type})")
     
     def semantic_search(self, query, limit=10, similarity_threshold=0.6):
@@ -117,186 +349,538 @@ class AdvancedChatHistory:
             print("❌ Could not generate embedding for query")
             return []
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, participant, message, embedding_vector, timestamp, session_id
-            FROM conversations 
-            WHERE embedding_vector IS NOT NULL
-        ''')
-        
+
+        # Fast path: let sqlite-vec do the KNN instead of scanning every
+        # row. Rows saved while the flag was off are dual-written going
+        # forward but never backfilled, so a trailing index would
+        # silently hide them - only trust it when it covers every
+        # stored embedding
+        if self.vec_available and self._vec_index_complete(cursor):
+            results = self._vec_search(cursor, query_embedding, limit, similarity_threshold)
+            if results is not None:
+                print(f"🎯 Found {len(results)} semantically similar conversations")
+                return results
+
+        self._ensure_matrix(conn)
+
+        if self._mat_count == 0:
+            print("🎯 Found 0 semantically similar conversations")
+            return []
+
+        # int8 matrix needs 4x less memory bandwidth than float32; widen to
+        # int32 for the accumulation, then rescale back to cosine similarity
+        matrix = self._mat[:self._mat_count]
+        scales = self._mat_scales[:self._mat_count]
+        ids = self._mat_ids[:self._mat_count]
+
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_vec /= np.linalg.norm(query_vec) or 1.0
+        query_blob, query_scale = self._quantize_embedding(query_vec)
+        query_int8 = np.frombuffer(query_blob, dtype=np.int8)
+
+        if NUMBA_AVAILABLE:
+            raw_scores = np.empty(matrix.shape[0], dtype=np.float32)
+            _scan_int8(matrix, query_int8.astype(np.float32), raw_scores)
+        else:
+            raw_scores = matrix.astype(np.int32) @ query_int8.astype(np.int32)
+        scores = raw_scores * (scales * query_scale)
+
+        # Top-K selection: O(M) argpartition plus a sort of only K rows,
+        # and result dicts are built for the K survivors alone
+        candidates = np.where(scores >= similarity_threshold)[0]
+        if len(candidates) > limit:
+            top = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+        else:
+            top = candidates
+        top = top[np.argsort(-scores[top])]
+
+        # Fetch display columns only for the K winners
+        top_ids = [int(ids[i]) for i in top]
+        meta = {}
+        if top_ids:
+            placeholders = ','.join('?' * len(top_ids))
+            cursor.execute(
+                f'SELECT id, participant, message, timestamp, session_id '
+                f'FROM conversations WHERE id IN ({placeholders})',
+                top_ids
+            )
+            meta = {row[0]: row for row in cursor.fetchall()}
+
         results = []
+        for i in top:
+            row = meta.get(int(ids[i]))
+            if row is None:
+                continue
+            results.append({
+                'id': row[0],
+                'participant': row[1],
+                'message': row[2],
+                'timestamp': row[3],
+                'session_id': row[4],
+                'similarity': float(scores[i])
+            })
+
+        print(f"🎯 Found {len(candidates)} semantically similar conversations")
+        return results
+
+    def _ensure_matrix(self, conn):
+        """Load (or reload after external writes) the in-memory scan matrix"""
+        version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if self._mat is not None and version == self._mat_version:
+            return
+        self._mat_version = version
+
+        # Fast cold-load path: memory-map the sidecar file instead of
+        # pulling every BLOB through the SQLite page cache
+        total = conn.execute(
+            '''SELECT COUNT(*) FROM conversations
+               WHERE embedding_int8 IS NOT NULL
+                  OR embedding_blob IS NOT NULL
+                  OR embedding_vector IS NOT NULL'''
+        ).fetchone()[0]
+        records = self._load_sidecar()
+        if records is not None and len(records) == total:
+            count = len(records)
+            capacity = max(64, 2 * count)
+            self._mat = np.zeros((capacity, self.EMBED_DIM), dtype=np.int8)
+            self._mat_ids = np.zeros(capacity, dtype=np.int64)
+            self._mat_scales = np.zeros(capacity, dtype=np.float32)
+            self._mat[:count] = records['vec']
+            self._mat_ids[:count] = records['id']
+            self._mat_scales[:count] = records['scale']
+            self._mat_count = count
+            del records
+            return
+
+        cursor = conn.cursor()
+        cursor.execute(self._SQL_SELECT_EMBEDDINGS)
+
+        ids = []
+        qvectors = []
+        scales = []
+        migrated = []
         for row in cursor.fetchall():
-            try:
-                stored_embedding = json.loads(row[3])
-                
-                # Calculate similarity
-                similarity = cosine_similarity(
-                    [query_embedding], 
-                    [stored_embedding]
-                )[0][0]
-                
-                if similarity >= similarity_threshold:
-                    results.append({
-                        'id': row[0],
-                        'participant': row[1],
-                        'message': row[2],
-                        'timestamp': row[4],
-                        'session_id': row[5],
-                        'similarity': similarity
-                    })
-            except (json.JSONDecodeError, IndexError):
+            if row[1] is not None:
+                vec = np.frombuffer(row[1], dtype=np.int8)
+                if vec.shape[0] != self.EMBED_DIM:
+                    continue
+                qvectors.append(vec)
+                scales.append(row[2])
+                ids.append(row[0])
                 continue
-        
-        # Sort by similarity
-        results.sort(key=lambda x: x['similarity'], reverse=True)
-        conn.close()
-        
-        print(f"🎯 Found {len(results)} semantically similar conversations")
-        return results[:limit]
+            # Legacy float32/JSON row - decode once and migrate it to int8
+            if row[3] is not None:
+                vector = np.frombuffer(row[3], dtype=np.float32).copy()
+            else:
+                try:
+                    vector = np.asarray(json.loads(row[4]), dtype=np.float32)
+                except (json.JSONDecodeError, TypeError, ValueError):
+                    continue
+            if vector.shape[0] != self.EMBED_DIM:
+                continue
+            vector /= np.linalg.norm(vector) or 1.0
+            int8_blob, scale = self._quantize_embedding(vector)
+            qvectors.append(np.frombuffer(int8_blob, dtype=np.int8))
+            scales.append(scale)
+            ids.append(row[0])
+            migrated.append((int8_blob, scale, row[0]))
+
+        if migrated:
+            with self._lock:
+                cursor.executemany(
+                    '''UPDATE conversations
+                       SET embedding_int8 = ?, embedding_scale = ?,
+                           embedding_blob = NULL, embedding_vector = NULL
+                       WHERE id = ?''',
+                    migrated
+                )
+                conn.commit()
+
+        count = len(qvectors)
+        capacity = max(64, 2 * count)
+        self._mat = np.zeros((capacity, self.EMBED_DIM), dtype=np.int8)
+        self._mat_ids = np.zeros(capacity, dtype=np.int64)
+        self._mat_scales = np.zeros(capacity, dtype=np.float32)
+        if count:
+            self._mat[:count] = np.vstack(qvectors)
+            self._mat_ids[:count] = ids
+            self._mat_scales[:count] = scales
+        self._mat_count = count
+        self._rewrite_sidecar()
+
+    def _emb_dtype(self):
+        """Fixed-width sidecar record: id, scale, int8 vector"""
+        return np.dtype([('id', '<i8'), ('scale', '<f4'),
+                         ('vec', 'i1', (self.EMBED_DIM,))])
+
+    def _load_sidecar(self):
+        """Memory-map the embedding sidecar, or None when absent/corrupt"""
+        try:
+            if os.path.getsize(self.emb_path) == 0:
+                return None
+            return np.memmap(self.emb_path, dtype=self._emb_dtype(), mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def _rewrite_sidecar(self):
+        """Rebuild the sidecar to mirror the in-memory matrix"""
+        try:
+            count = self._mat_count
+            records = np.zeros(count, dtype=self._emb_dtype())
+            records['id'] = self._mat_ids[:count]
+            records['scale'] = self._mat_scales[:count]
+            records['vec'] = self._mat[:count]
+            tmp_path = self.emb_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(records.tobytes())
+            os.replace(tmp_path, self.emb_path)
+        except OSError as e:
+            print(f"⚠️ Could not write embedding sidecar: {e}")
+
+    def _append_sidecar(self, conversation_id, int8_blob, scale):
+        """Append one record so the next cold start skips the BLOB scan"""
+        try:
+            record = np.zeros(1, dtype=self._emb_dtype())
+            record['id'] = conversation_id
+            record['scale'] = scale
+            record['vec'] = np.frombuffer(int8_blob, dtype=np.int8)
+            with open(self.emb_path, 'ab') as f:
+                f.write(record.tobytes())
+        except OSError as e:
+            print(f"⚠️ Could not append embedding sidecar: {e}")
+
+    def _append_matrix(self, conversation_id, int8_blob, scale):
+        """Append a freshly saved vector to the in-memory matrix"""
+        if self._mat is None or int8_blob is None:
+            return
+        if self._mat_count == len(self._mat):
+            # Double capacity so appends stay amortized O(1)
+            self._mat = np.resize(self._mat, (2 * len(self._mat), self.EMBED_DIM))
+            self._mat_ids = np.resize(self._mat_ids, 2 * len(self._mat_ids))
+            self._mat_scales = np.resize(self._mat_scales, 2 * len(self._mat_scales))
+        i = self._mat_count
+        self._mat[i] = np.frombuffer(int8_blob, dtype=np.int8)
+        self._mat_ids[i] = conversation_id
+        self._mat_scales[i] = scale
+        self._mat_count = i + 1
+        self._append_sidecar(conversation_id, int8_blob, scale)
     
     def text_search(self, query, limit=20):
         """Traditional text-based search"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
-        
+
+        if self.fts_available:
+            try:
+                cursor.execute('''
+                    SELECT c.id, c.participant, c.message, c.timestamp, c.session_id
+                    FROM conv_fts f
+                    JOIN conversations c ON c.id = f.rowid
+                    WHERE conv_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ''', (query, limit))
+                rows = cursor.fetchall()
+                return [self._text_result(row) for row in rows]
+            except sqlite3.OperationalError:
+                pass  # Query not valid FTS syntax - fall back to LIKE
+
         cursor.execute('''
             SELECT id, participant, message, timestamp, session_id
-            FROM conversations 
+            FROM conversations
             WHERE message LIKE ? OR participant LIKE ?
             ORDER BY timestamp DESC
             LIMIT ?
         ''', (f'%{query}%', f'%{query}%', limit))
         
+        results = [self._text_result(row) for row in cursor.fetchall()]
+        return results
+
+    def _text_result(self, row):
+        """Build a text-search result dict from a conversations row"""
+        return {
+            'id': row[0],
+            'participant': row[1],
+            'message': row[2],
+            'timestamp': row[3],
+            'session_id': row[4],
+            'similarity': 1.0  # Text matches get max similarity
+        }
+
+    def hybrid_search(self, query, limit=10, rrf_k=60):
+        """Fuse keyword (FTS5) and semantic rankings with Reciprocal Rank Fusion"""
+        print(f"🔀 Performing hybrid search for: '{query}'")
+
+        keyword_results = self.text_search(query, limit=50)
+        semantic_results = self.semantic_search(query, limit=50, similarity_threshold=0.0)
+
+        # RRF: score = sum over rankings of 1 / (k + rank)
+        fused = {}
+        for rank, result in enumerate(keyword_results, start=1):
+            entry = fused.setdefault(result['id'], {'result': result, 'score': 0.0})
+            entry['score'] += 1.0 / (rrf_k + rank)
+        for rank, result in enumerate(semantic_results, start=1):
+            entry = fused.setdefault(result['id'], {'result': result, 'score': 0.0})
+            entry['score'] += 1.0 / (rrf_k + rank)
+
+        ranked = sorted(fused.values(), key=lambda e: e['score'], reverse=True)[:limit]
+
         results = []
-        for row in cursor.fetchall():
-            results.append({
-                'id': row[0],
-                'participant': row[1],
-                'message': row[2],
-                'timestamp': row[3],
-                'session_id': row[4],
-                'similarity': 1.0  # Text matches get max similarity
-            })
-        
-        conn.close()
+        for entry in ranked:
+            result = dict(entry['result'])
+            result['rrf_score'] = entry['score']
+            results.append(result)
+
+        print(f"🎯 Hybrid search fused {len(fused)} candidates into {len(results)} results")
         return results
-    
+
     def get_conversation_context(self, conversation_id, context_size=3):
         """Get conversation context around a specific message"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        # Get the target conversation
-        cursor.execute('SELECT session_id, timestamp FROM conversations WHERE id = ?', (conversation_id,))
-        result = cursor.fetchone()
-        
-        if not result:
-            return []
-        
-        session_id, timestamp = result
-        
-        # Get conversations from same session around the timestamp
+        # Rank the session's messages in SQL and return only the window
+        # around the target instead of loading the whole session
         cursor.execute('''
-            SELECT id, participant, message, timestamp
-            FROM conversations 
-            WHERE session_id = ?
-            ORDER BY timestamp
-        ''', (session_id,))
-        
-        all_messages = cursor.fetchall()
-        
-        # Find the target message index
-        target_index = -1
-        for i, msg in enumerate(all_messages):
-            if msg[0] == conversation_id:
-                target_index = i
-                break
-        
-        if target_index == -1:
-            return []
-        
-        # Get context around the target
-        start_idx = max(0, target_index - context_size)
-        end_idx = min(len(all_messages), target_index + context_size + 1)
-        
+            WITH ranked AS (
+                SELECT id, participant, message, timestamp,
+                       ROW_NUMBER() OVER (ORDER BY timestamp) AS rn
+                FROM conversations
+                WHERE session_id = (SELECT session_id FROM conversations WHERE id = ?)
+            ),
+            target AS (
+                SELECT rn FROM ranked WHERE id = ?
+            )
+            SELECT r.id, r.participant, r.message, r.timestamp, r.rn = t.rn AS is_target
+            FROM ranked r, target t
+            WHERE r.rn BETWEEN t.rn - ? AND t.rn + ?
+            ORDER BY r.rn
+        ''', (conversation_id, conversation_id, context_size, context_size))
+
         context = []
-        for i in range(start_idx, end_idx):
-            msg = all_messages[i]
+        for row in cursor.fetchall():
             context.append({
-                'id': msg[0],
-                'participant': msg[1],
-                'message': msg[2],
-                'timestamp': msg[3],
-                'is_target': i == target_index
+                'id': row[0],
+                'participant': row[1],
+                'message': row[2],
+                'timestamp': row[3],
+                'is_target': bool(row[4])
             })
-        
-        conn.close()
+
         return context
     
     def get_session_statistics(self):
         """Get statistics about conversations and sessions"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        # Total conversations
-        cursor.execute('SELECT COUNT(*) FROM conversations')
-        total_conversations = cursor.fetchone()[0]
-        
-        # Conversations with embeddings
-        cursor.execute('SELECT COUNT(*) FROM conversations WHERE embedding_vector IS NOT NULL')
-        conversations_with_embeddings = cursor.fetchone()[0]
-        
-        # Unique participants
-        cursor.execute('SELECT COUNT(DISTINCT participant) FROM conversations')
-        unique_participants = cursor.fetchone()[0]
-        
-        # Active sessions
-        cursor.execute('SELECT COUNT(*) FROM llm_sessions WHERE status = "active"')
-        active_sessions = cursor.fetchone()[0]
-        
-        # Most active participant
+        # One pass over conversations for every aggregate, plus a single
+        # indexed count on llm_sessions
         cursor.execute('''
-            SELECT participant, COUNT(*) as msg_count 
-            FROM conversations 
-            GROUP BY participant 
-            ORDER BY msg_count DESC 
-            LIMIT 1
+            WITH per_participant AS (
+                SELECT participant, COUNT(*) AS msg_count
+                FROM conversations
+                GROUP BY participant
+                ORDER BY msg_count DESC
+            )
+            SELECT COUNT(*),
+                   SUM(embedding_int8 IS NOT NULL
+                       OR embedding_blob IS NOT NULL
+                       OR embedding_vector IS NOT NULL),
+                   COUNT(DISTINCT participant),
+                   (SELECT participant FROM per_participant LIMIT 1),
+                   (SELECT msg_count FROM per_participant LIMIT 1)
+            FROM conversations
         ''')
-        most_active = cursor.fetchone()
-        
-        conn.close()
-        
+        total, with_embeddings, unique_participants, top_participant, top_count = cursor.fetchone()
+
+        cursor.execute('SELECT COUNT(*) FROM llm_sessions WHERE status = "active"')
+        active_sessions = cursor.fetchone()[0]
+
         return {
-            'total_conversations': total_conversations,
-            'conversations_with_embeddings': conversations_with_embeddings,
+            'total_conversations': total,
+            'conversations_with_embeddings': with_embeddings or 0,
             'unique_participants': unique_participants,
             'active_sessions': active_sessions,
-            'most_active_participant': most_active[0] if most_active else None,
-            'most_active_count': most_active[1] if most_active else 0
+            'most_active_participant': top_participant,
+            'most_active_count': top_count or 0
         }
     
+    def _vec_index_complete(self, cursor):
+        """True when every stored embedding is present in the vec table"""
+        try:
+            vec_count = cursor.execute(
+                'SELECT COUNT(*) FROM vec_conversations').fetchone()[0]
+            emb_count = cursor.execute(
+                '''SELECT COUNT(*) FROM conversations
+                   WHERE embedding_int8 IS NOT NULL
+                      OR embedding_blob IS NOT NULL
+                      OR embedding_vector IS NOT NULL''').fetchone()[0]
+        except sqlite3.OperationalError:
+            return False
+        return vec_count >= emb_count
+
+    def _vec_search(self, cursor, query_embedding, limit, similarity_threshold):
+        """KNN lookup via the sqlite-vec index; returns None on failure"""
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_vec /= np.linalg.norm(query_vec)
+
+        try:
+            cursor.execute('''
+                SELECT c.id, c.participant, c.message, c.timestamp, c.session_id, v.distance
+                FROM vec_conversations v
+                JOIN conversations c ON c.id = v.rowid
+                WHERE v.embedding MATCH ?
+                ORDER BY v.distance
+                LIMIT ?
+            ''', (sqlite3.Binary(query_vec.tobytes()), limit))
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ vec index query failed, falling back to scan: {e}")
+            return None
+
+        results = []
+        for row in cursor.fetchall():
+            # L2 distance on unit vectors maps back to cosine similarity
+            similarity = 1.0 - (row[5] ** 2) / 2.0
+            if similarity >= similarity_threshold:
+                results.append({
+                    'id': row[0],
+                    'participant': row[1],
+                    'message': row[2],
+                    'timestamp': row[3],
+                    'session_id': row[4],
+                    'similarity': similarity
+                })
+        return results
+
+    def _quantize_embedding(self, embedding):
+        """Quantize a vector to (int8 BLOB, float scale) with v ~ int8 * scale"""
+        if embedding is not None and len(embedding) not in (0, self.EMBED_DIM):
+            # The matrix, sidecar and vec index are all sized for EMBED_DIM;
+            # a vector from a different model cannot enter the scan path
+            print(f"⚠️ Dropping {len(embedding)}-D embedding (expected {self.EMBED_DIM})")
+            embedding = None
+        if embedding is None or len(embedding) == 0:
+            return None, None
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector = vector / (np.linalg.norm(vector) or 1.0)
+        scale = float(np.max(np.abs(vector))) / 127.0 or (1.0 / 127.0)
+        quantized = np.round(vector / scale).astype(np.int8)
+        return sqlite3.Binary(quantized.tobytes()), scale
+
+    def _encode_embedding(self, embedding):
+        """Encode an embedding as a unit-length float32 BLOB for storage
+
+        Normalizing once at insert time turns cosine similarity into a
+        plain dot product at search time.
+        """
+        if embedding is None or len(embedding) == 0:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+        return sqlite3.Binary(vector.tobytes())
+
+    def _embed_key(self, text):
+        """Cache key: sha256 over model + text"""
+        return hashlib.sha256((self.EMBED_MODEL + "\x00" + text).encode()).digest()
+
+    def _cache_lookup(self, key):
+        """Check the in-process dict, then the persistent cache table"""
+        cached = self._embed_cache.get(key)
+        if cached is not None:
+            return cached
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT vec FROM embedding_cache WHERE hash = ?', (key,))
+        row = cursor.fetchone()
+
+        if row is None:
+            return None
+        embedding = np.frombuffer(row[0], dtype=np.float32).tolist()
+        self._cache_store_local(key, embedding)
+        return embedding
+
+    def _cache_store_local(self, key, embedding):
+        if len(self._embed_cache) >= self.EMBED_CACHE_SIZE:
+            self._embed_cache.pop(next(iter(self._embed_cache)))
+        self._embed_cache[key] = embedding
+
+    def _cache_store(self, entries):
+        """Persist freshly fetched (key, embedding) pairs"""
+        if not entries:
+            return
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.executemany(
+                'INSERT OR REPLACE INTO embedding_cache (hash, model, vec) VALUES (?, ?, ?)',
+                [(key, self.EMBED_MODEL, self._encode_embedding(embedding))
+                 for key, embedding in entries]
+            )
+            conn.commit()
+        for key, embedding in entries:
+            self._cache_store_local(key, embedding)
+
     def _get_embedding(self, text):
-        """Get embedding from Archie"""
+        """Get embedding from Archie (cached by content hash)"""
+        key = self._embed_key(text)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+
         try:
-            response = requests.post(f"{self.base_url}/embeddings",
+            response = self._http.post(f"{self.base_url}/embeddings",
                 json={
-                    "model": "text-embedding-nomic-embed-text-v1.5-embedding",
+                    "model": self.EMBED_MODEL,
                     "input": text
-                })
-            
+                }, timeout=(1, 30))
+
             if response.status_code == 200:
-                return response.json()['data'][0]['embedding']
+                embedding = response.json()['data'][0]['embedding']
+                self._cache_store([(key, embedding)])
+                return embedding
             return None
         except Exception as e:
             print(f"❌ Archie embedding error: {e}")
             return None
 
+    def _get_embeddings_batch(self, texts):
+        """Embed several texts with a single /embeddings request (cache-aware)"""
+        texts = list(texts)
+        if not texts:
+            return []
+
+        keys = [self._embed_key(text) for text in texts]
+        embeddings = [self._cache_lookup(key) for key in keys]
+
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not misses:
+            return embeddings
+
+        try:
+            response = self._http.post(f"{self.base_url}/embeddings",
+                json={
+                    "model": self.EMBED_MODEL,
+                    "input": [texts[i] for i in misses]
+                }, timeout=(1, 30))
+
+            if response.status_code == 200:
+                data = sorted(response.json()['data'], key=lambda item: item['index'])
+                fresh = []
+                for miss_idx, item in zip(misses, data):
+                    embeddings[miss_idx] = item['embedding']
+                    fresh.append((keys[miss_idx], item['embedding']))
+                self._cache_store(fresh)
+        except Exception as e:
+            print(f"❌ Archie batch embedding error: {e}")
+
+        return embeddings
+
 # CLI Interface
 def main():
-    history = AdvancedChatHistory()
-    
     if len(sys.argv) < 2:
         print("🗣️ Advanced Chat History - LeoDock Platform")
         print("=" * 50)
@@ -304,10 +888,13 @@ def main():
         print("  python advanced_chat_history.py save <participant> <message>")
         print("  python advanced_chat_history.py search <query>")
         print("  python advanced_chat_history.py semantic <query>")
+        print("  python advanced_chat_history.py hybrid <query>")
         print("  python advanced_chat_history.py context <conversation_id>")
         print("  python advanced_chat_history.py stats")
         print("  python advanced_chat_history.py demo")
         sys.exit(1)
+
+    history = AdvancedChatHistory()
     
     command = sys.argv[1]
     
@@ -339,6 +926,17 @@ def main():
             print(f"   Similarity: {result['similarity']:.3f} | {result['timestamp']}")
             print()
             
+    elif command == "hybrid" and len(sys.argv) > 2:
+        query = " ".join(sys.argv[2:])
+        results = history.hybrid_search(query)
+
+        print(f"🔀 Hybrid search results for: '{query}'")
+        print("=" * 50)
+        for result in results:
+            print(f"📝 {result['participant']}: {result['message'][:80]}...")
+            print(f"   RRF score: {result['rrf_score']:.4f} | {result['timestamp']}")
+            print()
+
     elif command == "context" and len(sys.argv) > 2:
         try:
             conversation_id = int(sys.argv[2])
@@ -379,18 +977,25 @@ def main():
             ("claude_code", "Implementing connection manager to prevent duplicate processes")
         ]
         
-        for participant, message in demo_conversations:
-            history.save_conversation(participant, message, session_id)
-        
+        history.save_conversations_bulk(demo_conversations, session_id)
+
+        # The post-save reads are independent: overlap the semantic
+        # search (embedding round trip + scan) with the stats query so
+        # the demo takes max of the two instead of their sum
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            search_future = pool.submit(history.semantic_search, "browser issues", 3)
+            stats_future = pool.submit(history.get_session_statistics)
+            results = search_future.result()
+            stats = stats_future.result()
+
         # Test searches
         print(f"\n🔍 Testing semantic search for 'browser issues':")
-        results = history.semantic_search("browser issues", limit=3)
         for result in results:
             print(f"  - {result['participant']}: {result['message'][:50]}... (similarity: {result['similarity']:.3f})")
-        
+
         # Show stats
         print(f"\n📊 Demo Statistics:")
-        stats = history.get_session_statistics()
         print(f"  Total conversations: {stats['total_conversations']}")
         print(f"  With embeddings: {stats['conversations_with_embeddings']}")
         
@@ -4,12 +4,14 @@ Standardized interface for AI agents (Claude Code, Copilot, Cline, etc.)
 to communicate with LEO supervisor
 """
 
+import collections
 import json
+import time
 import uuid
 import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import logging
 
@@ -34,46 +36,92 @@ class TaskStatus(Enum):
 @dataclass
 class AgentTask:
     """Standardized task structure for agents"""
+    # Manual __slots__ (the slots=True dataclass flag needs 3.10 and
+    # setup.py declares a 3.6 floor): no per-instance __dict__, so each
+    # task is a flat fixed-size record. Slots rule out class-level field
+    # defaults, hence every field is required at construction.
+    __slots__ = ('id', 'description', 'priority', 'status', 'agent_type',
+                 'created_at', 'updated_at', 'context', 'dependencies',
+                 'acceptance_criteria', 'estimated_effort',
+                 '_status_value', '_agent_type_value',
+                 '_created_iso', '_updated_iso')
+
     id: str
     description: str
     priority: str  # low, medium, high, critical
     status: TaskStatus
     agent_type: AgentType
-    created_at: datetime
-    updated_at: datetime
+    created_at: float  # epoch seconds; formatted to ISO only in to_dict
+    updated_at: float
     context: Dict[str, Any]
-    dependencies: List[str] = None
-    acceptance_criteria: List[str] = None
-    estimated_effort: str = None  # small, medium, large
-    
+    dependencies: List[str]
+    acceptance_criteria: List[str]
+    estimated_effort: str  # small, medium, large
+
+    def __post_init__(self):
+        # Serialized forms cached once; status/updated_at refresh theirs
+        # in update_task_status, the rest never change
+        self._status_value = self.status.value
+        self._agent_type_value = self.agent_type.value
+        self._created_iso = datetime.fromtimestamp(self.created_at).isoformat()
+        self._updated_iso = datetime.fromtimestamp(self.updated_at).isoformat()
+
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        data['status'] = self.status.value
-        data['agent_type'] = self.agent_type.value
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
-        return data
+        # Built by hand rather than dataclasses.asdict, which would
+        # recursively deep-copy context and the criteria lists per call
+        return {
+            'id': self.id,
+            'description': self.description,
+            'priority': self.priority,
+            'status': self._status_value,
+            'agent_type': self._agent_type_value,
+            'created_at': self._created_iso,
+            'updated_at': self._updated_iso,
+            'context': self.context,
+            'dependencies': self.dependencies,
+            'acceptance_criteria': self.acceptance_criteria,
+            'estimated_effort': self.estimated_effort
+        }
 
 
-@dataclass 
+@dataclass
 class AgentInteraction:
     """Single interaction between agent and system"""
+    __slots__ = ('id', 'agent_id', 'agent_type', 'timestamp', 'command',
+                 'output', 'files_modified', 'success', 'context',
+                 'leo_analysis', '_agent_type_value', '_timestamp_iso')
+
     id: str
     agent_id: str
     agent_type: AgentType
-    timestamp: datetime
+    timestamp: float  # epoch seconds; formatted to ISO only in to_dict
     command: str
     output: str
     files_modified: List[str]
     success: bool
     context: Dict[str, Any]
-    leo_analysis: Optional[Dict[str, Any]] = None
-    
+    leo_analysis: Optional[Dict[str, Any]]
+
+    def __post_init__(self):
+        # Interactions are immutable after creation - format once
+        self._agent_type_value = self.agent_type.value
+        self._timestamp_iso = datetime.fromtimestamp(self.timestamp).isoformat()
+
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        data['agent_type'] = self.agent_type.value
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
+        # Same hand-rolled construction as AgentTask.to_dict: no
+        # recursive copies of context/leo_analysis on every call
+        return {
+            'id': self.id,
+            'agent_id': self.agent_id,
+            'agent_type': self._agent_type_value,
+            'timestamp': self._timestamp_iso,
+            'command': self.command,
+            'output': self.output,
+            'files_modified': self.files_modified,
+            'success': self.success,
+            'context': self.context,
+            'leo_analysis': self.leo_analysis
+        }
 
 
 class AgentInterface:
@@ -82,12 +130,18 @@ class AgentInterface:
     Handles task management, monitoring, and escalation
     """
     
-    def __init__(self, agent_type: AgentType, agent_id: str = None):
+    def __init__(self, agent_type: AgentType, agent_id: str = None,
+                 history_cap: int = 1000):
         self.agent_type = agent_type
         self.agent_id = agent_id or str(uuid.uuid4())
         self.leo_supervisor = None  # Will be injected
         self.current_tasks: Dict[str, AgentTask] = {}
-        self.interaction_history: List[AgentInteraction] = []
+        # Bounded: an unbounded list would pin every interaction (with
+        # full output text) in RAM for the life of the process
+        self.interaction_history = collections.deque(maxlen=history_cap)
+        # Task descriptions, maintained incrementally so the per-event
+        # monitoring path never rebuilds the list from current_tasks
+        self._goal_cache: List[str] = []
         self.monitoring_enabled = True
         
         # Callbacks for agent-specific behavior
@@ -112,15 +166,16 @@ class AgentInterface:
             interaction_id for tracking
         """
         interaction = AgentInteraction(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             agent_id=self.agent_id,
             agent_type=self.agent_type,
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             command=command,
             output=output,
             files_modified=files_modified or [],
             success=success,
-            context=context or {}
+            context=context or {},
+            leo_analysis=None
         )
         
         self.interaction_history.append(interaction)
@@ -132,7 +187,7 @@ class AgentInterface:
                     'command': command,
                     'output': output,
                     'files_modified': files_modified or [],
-                    'goals': [task.description for task in self.current_tasks.values()],
+                    'goals': self._goal_cache,
                     'context': context or {}
                 })
                 
@@ -171,7 +226,7 @@ class AgentInterface:
             escalation_context = {
                 'context': f"Agent {self.agent_id} needs assistance",
                 'problem': analysis.get('guidance', 'Unspecified issue'),
-                'attempted_solutions': [i.command for i in self.interaction_history[-5:]],
+                'attempted_solutions': [i.command for i in list(self.interaction_history)[-5:]],
                 'current_state': {
                     'tasks': [task.to_dict() for task in self.current_tasks.values()],
                     'recent_interactions': len(self.interaction_history)
@@ -190,21 +245,24 @@ class AgentInterface:
                  dependencies: List[str] = None,
                  acceptance_criteria: List[str] = None) -> str:
         """Add a new task for the agent"""
+        now = time.time()
         task = AgentTask(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             description=description,
             priority=priority,
             status=TaskStatus.PENDING,
             agent_type=self.agent_type,
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            created_at=now,
+            updated_at=now,
             context=context or {},
             dependencies=dependencies,
-            acceptance_criteria=acceptance_criteria
+            acceptance_criteria=acceptance_criteria,
+            estimated_effort=None
         )
         
         self.current_tasks[task.id] = task
-        
+        self._goal_cache.append(description)
+
         if self.on_task_updated:
             self.on_task_updated(task)
             
@@ -215,7 +273,9 @@ class AgentInterface:
         if task_id in self.current_tasks:
             task = self.current_tasks[task_id]
             task.status = status
-            task.updated_at = datetime.now()
+            task.updated_at = time.time()
+            task._status_value = status.value
+            task._updated_iso = datetime.fromtimestamp(task.updated_at).isoformat()
             
             if context:
                 task.context.update(context)
@@ -226,6 +286,9 @@ class AgentInterface:
             # Remove completed tasks from active list
             if status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
                 del self.current_tasks[task_id]
+                # Rebuild only on removal; additions append in add_task
+                self._goal_cache = [t.description
+                                    for t in self.current_tasks.values()]
     
     def get_pending_tasks(self) -> List[AgentTask]:
         """Get all pending tasks"""
@@ -251,7 +314,7 @@ class AgentInterface:
             
         current_state = {
             'completed_tasks': [i.command for i in self.interaction_history if i.success],
-            'current_tasks': [task.description for task in self.current_tasks.values()],
+            'current_tasks': list(self._goal_cache),
             'issues': [i.command for i in self.interaction_history if not i.success],
             'project_goals': []  # Could be extracted from task context
         }
@@ -1,65 +1,169 @@
 import os
+import mmap
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import hashlib
 from chat_history_manager import ChatHistoryManager
 
+# Event-based watching (inotify/FSEvents) beats polling when available
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+    class FileSystemEventHandler:  # minimal stand-in so the class below imports
+        pass
+
+
+class _PyFileEventHandler(FileSystemEventHandler):
+    """Routes filesystem events for .py files to the auto-assist analyzers"""
+
+    DEBOUNCE_SECONDS = 0.5  # editors fire several events per save
+
+    def __init__(self, auto_assist):
+        self.auto_assist = auto_assist
+        self._last_event = {}  # path -> monotonic time of last handled event
+
+    def _should_handle(self, event):
+        if event.is_directory or not event.src_path.endswith('.py'):
+            return False
+        now = time.monotonic()
+        if now - self._last_event.get(event.src_path, 0.0) < self.DEBOUNCE_SECONDS:
+            return False
+        self._last_event[event.src_path] = now
+        return True
+
+    def on_created(self, event):
+        if self._should_handle(event):
+            self.auto_assist.submit_analysis(
+                self.auto_assist._analyze_new_file, os.path.relpath(event.src_path))
+
+    def on_modified(self, event):
+        if self._should_handle(event):
+            self.auto_assist.submit_analysis(
+                self.auto_assist._analyze_modified_file, os.path.relpath(event.src_path))
+
+
 class LeoDockAutoAssist:
     def __init__(self):
         self.base_url = "http://127.0.0.1:1234/v1"
+        # Pooled keep-alive session shared by Leo and Archie calls
+        self._http = requests.Session()
+        self._http.mount("http://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
+        self._http.headers['Connection'] = 'keep-alive'
         self.chat_manager = ChatHistoryManager()
         self.seen_files = set()
         self.file_hashes = {}
+        self._stat_cache = {}  # path -> (st_mtime_ns, st_size)
+        # Analyses run off the watcher thread so several files pipeline;
+        # LLM sub-calls get their own pool so analyses can't starve them
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._llm_executor = ThreadPoolExecutor(max_workers=4)
         self.monitoring = True
-        
+
+    def submit_analysis(self, analyze_fn, filename):
+        """Run an analysis in the worker pool so the watcher never blocks"""
+        self._executor.submit(analyze_fn, filename)
+
     def monitor_claude_activity(self):
         """Monitor for new files and automatically get LLM assistance"""
         print("🔍 LeoDock Auto-Assist monitoring started...")
         print("Create any new .py file and Leo will automatically analyze it!")
         print("Modify existing files and get automatic feedback!")
         print("Press Ctrl+C to stop monitoring\n")
-        
+
+        if WATCHDOG_AVAILABLE:
+            self._monitor_with_events()
+        else:
+            print("⚠️ watchdog not installed - falling back to 3s polling")
+            self._monitor_with_polling()
+
+    def _monitor_with_events(self):
+        """Let the kernel tell us about file changes instead of polling"""
+        observer = Observer()
+        observer.schedule(_PyFileEventHandler(self), '.', recursive=False)
+        observer.start()
+
+        try:
+            while self.monitoring:
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            print("\n🛑 Auto-assist monitoring stopped by user")
+        except Exception as e:
+            print(f"❌ Monitoring error: {e}")
+        finally:
+            observer.stop()
+            observer.join()
+
+    def _monitor_with_polling(self):
+        """Polling fallback when watchdog is unavailable"""
         # Initialize with current files
         self.seen_files = set(os.listdir('.'))
         for file in self.seen_files:
             if file.endswith('.py'):
+                self._stat_cache[file] = self._stat_signature(file)
                 self.file_hashes[file] = self._get_file_hash(file)
-        
+
         try:
             while self.monitoring:
                 time.sleep(3)  # Check every 3 seconds
                 current_files = set(os.listdir('.'))
-                
+
                 # Check for new files
                 new_files = current_files - self.seen_files
                 for new_file in new_files:
                     if new_file.endswith('.py'):
                         self._analyze_new_file(new_file)
-                
-                # Check for modified files
+
+                # Check for modified files (cheap stat before any hashing)
                 for file in current_files:
                     if file.endswith('.py') and file in self.file_hashes:
+                        sig = self._stat_signature(file)
+                        if sig == self._stat_cache.get(file):
+                            continue
+                        self._stat_cache[file] = sig
                         current_hash = self._get_file_hash(file)
                         if current_hash != self.file_hashes.get(file):
                             self._analyze_modified_file(file)
                             self.file_hashes[file] = current_hash
-                
+
                 # Update tracking
                 self.seen_files = current_files
                 for file in self.seen_files:
                     if file.endswith('.py') and file not in self.file_hashes:
+                        self._stat_cache[file] = self._stat_signature(file)
                         self.file_hashes[file] = self._get_file_hash(file)
-                        
+
         except KeyboardInterrupt:
             print("\n🛑 Auto-assist monitoring stopped by user")
         except Exception as e:
             print(f"❌ Monitoring error: {e}")
     
+    def _stat_signature(self, filename):
+        """Cheap change signature: (mtime_ns, size) from one stat call"""
+        try:
+            st = os.stat(filename)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
     def _get_file_hash(self, filename):
-        """Get MD5 hash of file content"""
+        """Get BLAKE2b hash of file content via mmap (no userspace copy)"""
         try:
             with open(filename, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
+                size = os.fstat(f.fileno()).st_size
+                # mmap is not worth it below a page; empty files can't be mapped
+                if size < mmap.PAGESIZE:
+                    return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.blake2b(mm, digest_size=16).hexdigest()
         except:
             return None
     
@@ -75,11 +179,15 @@ class LeoDockAutoAssist:
                 print(f"⏳ File {filename} is empty, skipping analysis")
                 return
                 
-            # Get Leo's analysis
-            leo_analysis = self._get_leo_analysis(filename, content, "new_file")
-            
-            # Get Archie's embedding
-            embedding_len, _ = self._get_archie_embedding(f"New Python file: {filename}\n{content[:200]}")
+            # Leo's analysis and Archie's embedding are independent HTTP
+            # calls - run them concurrently instead of back to back
+            leo_future = self._llm_executor.submit(
+                self._get_leo_analysis, filename, content, "new_file")
+            archie_future = self._llm_executor.submit(
+                self._get_archie_embedding, f"New Python file: {filename}\n{content[:200]}")
+
+            leo_analysis = leo_future.result()
+            embedding_len, _ = archie_future.result()
             
             print(f"🦁 Leo's automatic analysis of {filename}:")
             print(f"   {leo_analysis}")
@@ -133,7 +241,7 @@ class LeoDockAutoAssist:
                 system_prompt = "You are Leo. Claude Code just modified a Python file. Analyze the current state and provide concise feedback on the code quality and potential improvements."
                 user_prompt = f"Modified file: {filename}\n\nCurrent content:\n{content[:1000]}{'...' if len(content) > 1000 else ''}"
             
-            response = requests.post(f"{self.base_url}/chat/completions", 
+            response = self._http.post(f"{self.base_url}/chat/completions", 
                 json={
                     "model": "meta-llama-3.1-8b-instruct",
                     "messages": [
@@ -155,7 +263,7 @@ class LeoDockAutoAssist:
     def _get_archie_embedding(self, text):
         """Get embedding from Archie"""
         try:
-            response = requests.post(f"{self.base_url}/embeddings",
+            response = self._http.post(f"{self.base_url}/embeddings",
                 json={
                     "model": "text-embedding-nomic-embed-text-v1.5-embedding",
                     "input": text
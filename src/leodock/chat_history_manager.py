@@ -1,23 +1,53 @@
+import array
 import sqlite3
 import json
-import pickle
+import logging
+import queue
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 import requests
 
+logger = logging.getLogger(__name__)
+
 class ChatHistoryManager:
     def __init__(self, db_path="data/conversations.db"):
         self.db_path = db_path
         self.base_url = "http://127.0.0.1:1234/v1"
+        # One persistent connection per thread: opening per call
+        # re-parses the schema, rebuilds the page cache and renegotiates
+        # the journal on every tiny write
+        self._local = threading.local()
         self.init_database()
-    
+        # Embedding jobs run on a background worker so store_conversation
+        # never stalls on the HTTP round trip to Archie; the session
+        # keeps one pooled connection warm for all of them
+        self.session = requests.Session()
+        self._emb_q = queue.Queue()
+        self._emb_worker = threading.Thread(target=self._embedding_worker, daemon=True)
+        self._emb_worker.start()
+
+    def _conn(self):
+        """Return this thread's persistent connection, opening it lazily"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-65536')
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._local.conn = conn
+        return conn
+
     def init_database(self):
         """Initialize SQLite database for conversation storage"""
         # Ensure data directory exists
         import os
         os.makedirs("data", exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
+
+        conn = self._conn()
         cursor = conn.cursor()
         
         # Main conversations table
@@ -44,183 +74,232 @@ class ChatHistoryManager:
             )
         ''')
         
-        # Search index for text-based search
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS search_index (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                conversation_id INTEGER NOT NULL,
-                token TEXT NOT NULL,
-                term_frequency INTEGER DEFAULT 1,
-                FOREIGN KEY (conversation_id) REFERENCES conversations (id)
-            )
-        ''')
-        
         # Create indexes for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON conversations(timestamp)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_session ON conversations(session_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_token ON search_index(token)')
-        
-        conn.commit()
-        conn.close()
-        print("📊 Chat history database initialized successfully!")
+
+        # FTS5 full-text index kept in sync by triggers; replaces the
+        # hand-rolled search_index table and its LIKE '%...%' scans with
+        # ranked BM25 lookups
+        self.fts_available = False
+        # 'rebuild' re-tokenizes the whole table - only worth paying
+        # the one time the FTS table comes into existence, not on
+        # every CLI invocation that constructs a manager
+        fts_is_new = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='conv_fts'"
+        ).fetchone() is None
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS conv_fts
+                USING fts5(prompt, response, content='conversations',
+                           content_rowid='id', tokenize='porter unicode61')
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conv_fts_ai AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conv_fts(rowid, prompt, response)
+                    VALUES (new.id, new.prompt, new.response);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conv_fts_ad AFTER DELETE ON conversations BEGIN
+                    INSERT INTO conv_fts(conv_fts, rowid, prompt, response)
+                    VALUES ('delete', old.id, old.prompt, old.response);
+                END
+            ''')
+            # Token-level vocabulary view, used by get_statistics
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS conv_fts_vocab
+                USING fts5vocab(conv_fts, 'row')
+            ''')
+            # Backfill rows that predate the FTS table, once; the
+            # triggers keep it current from here on
+            if fts_is_new:
+                cursor.execute("INSERT INTO conv_fts(conv_fts) VALUES ('rebuild')")
+            # The bespoke index is superseded; drop it if it exists
+            cursor.execute('DROP TABLE IF EXISTS search_index')
+            self.fts_available = True
+        except sqlite3.OperationalError:
+            pass  # SQLite built without FTS5 - LIKE fallback still works
+
+        logger.info("📊 Chat history database initialized successfully!")
     
     def store_conversation(self, prompt: str, response: str, session_id: str = None, 
                           llm_analysis: Dict = None, metadata: Dict = None) -> int:
         """Store a conversation and generate embeddings"""
-        conn = sqlite3.connect(self.db_path)
+        text = f"{prompt} {response}"
+
+        # Conversation row and search-index tokens land in one
+        # transaction: one fsync for the whole logical write
+        conn = self._conn()
         cursor = conn.cursor()
-        
-        # Insert conversation
-        cursor.execute('''
-            INSERT INTO conversations 
-            (timestamp, session_id, prompt, response, llm_analysis, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            datetime.now().isoformat(),
-            session_id,
-            prompt,
-            response,
-            json.dumps(llm_analysis) if llm_analysis else None,
-            json.dumps(metadata) if metadata else None
-        ))
-        
-        conversation_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        # Generate and store embedding asynchronously
-        self._generate_embedding(conversation_id, f"{prompt} {response}")
-        
-        # Create search index tokens
-        self._index_conversation_text(conversation_id, f"{prompt} {response}")
-        
-        print(f"💾 Stored conversation {conversation_id}")
+        conn.execute('BEGIN')
+        try:
+            cursor.execute('''
+                INSERT INTO conversations
+                (timestamp, session_id, prompt, response, llm_analysis, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                datetime.now().isoformat(),
+                session_id,
+                prompt,
+                response,
+                # Compact separators: smaller rows and a faster encode
+                # than the default padded output
+                json.dumps(llm_analysis, separators=(',', ':')) if llm_analysis else None,
+                json.dumps(metadata, separators=(',', ':')) if metadata else None
+            ))
+
+            conversation_id = cursor.lastrowid
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        # Embedding happens off-thread; the caller returns immediately
+        self._emb_q.put((conversation_id, text))
+
+        logger.debug("💾 Stored conversation %s", conversation_id)
         return conversation_id
-    
-    def _generate_embedding(self, conversation_id: int, text: str):
-        """Generate embedding using Archie and store it"""
+
+    # Most embeddings the endpoint is asked for in one request during a
+    # bulk ingest burst
+    EMBED_BATCH_MAX = 32
+
+    def _embedding_worker(self):
+        """Drain queued embedding jobs in the background, batching bursts"""
+        while True:
+            jobs = [self._emb_q.get()]
+            # Gather whatever else arrived (waiting at most 50ms for
+            # stragglers) so a burst costs one HTTP request and one
+            # executemany instead of one round trip per conversation
+            while len(jobs) < self.EMBED_BATCH_MAX:
+                try:
+                    jobs.append(self._emb_q.get(timeout=0.05))
+                except queue.Empty:
+                    break
+            try:
+                blobs = self._fetch_embeddings([text for _, text in jobs])
+                rows = [(cid, blob)
+                        for (cid, _), blob in zip(jobs, blobs) if blob is not None]
+                if rows:
+                    self._conn().executemany('''
+                        INSERT INTO conversation_embeddings (conversation_id, embedding_vector)
+                        VALUES (?, ?)
+                    ''', rows)
+            except Exception as e:
+                # Never let one bad batch kill the daemon - e.g. a
+                # 'database is locked' from another manager writing the
+                # same file drops this batch's embeddings but the worker
+                # lives on to serve the next one
+                logger.warning("⚠️ Embedding batch failed: %s", e)
+            finally:
+                for _ in jobs:
+                    self._emb_q.task_done()
+
+    def _fetch_embeddings(self, texts: List[str]):
+        """Fetch embeddings for a whole batch of texts in one request"""
         try:
-            response = requests.post(f"{self.base_url}/embeddings",
+            response = self.session.post(f"{self.base_url}/embeddings",
                 json={
                     "model": "text-embedding-nomic-embed-text-v1.5-embedding",
-                    "input": text
+                    "input": texts
                 })
-            
+
             if response.status_code == 200:
-                embedding = response.json()['data'][0]['embedding']
-                
-                # Store embedding as binary blob
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO conversation_embeddings (conversation_id, embedding_vector)
-                    VALUES (?, ?)
-                ''', (conversation_id, pickle.dumps(embedding)))
-                conn.commit()
-                conn.close()
-                
-                print(f"🔍 Generated embedding for conversation {conversation_id}")
-            
+                data = sorted(response.json()['data'], key=lambda item: item['index'])
+                logger.debug("🔍 Generated %d embeddings in one request", len(data))
+                # Packed float32 (4 bytes per value) instead of pickled
+                # Python floats; read back with array.array('f') or
+                # np.frombuffer(blob, dtype=np.float32)
+                return [array.array('f', item['embedding']).tobytes()
+                        for item in data]
+
         except Exception as e:
-            print(f"❌ Error generating embedding: {e}")
-    
-    def _index_conversation_text(self, conversation_id: int, text: str):
-        """Create search index tokens from conversation text"""
-        # Simple tokenization (could be enhanced with proper NLP)
-        words = text.lower().split()
-        word_freq = {}
-        
-        for word in words:
-            # Remove punctuation and filter out short words
-            clean_word = ''.join(c for c in word if c.isalnum())
-            if len(clean_word) > 2:
-                word_freq[clean_word] = word_freq.get(clean_word, 0) + 1
-        
-        # Store in search index
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        for word, freq in word_freq.items():
-            cursor.execute('''
-                INSERT OR REPLACE INTO search_index (conversation_id, token, term_frequency)
-                VALUES (?, ?, ?)
-            ''', (conversation_id, word, freq))
-        
-        conn.commit()
-        conn.close()
-    
-    def search_conversations(self, query: str, limit: int = 20) -> List[Dict]:
-        """Search conversations by text content"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Simple text search (can be enhanced with TF-IDF scoring)
-        search_terms = query.lower().split()
-        
-        if len(search_terms) == 1:
-            cursor.execute('''
-                SELECT DISTINCT c.id, c.timestamp, c.session_id, c.prompt, c.response, c.metadata
-                FROM conversations c
-                JOIN search_index si ON c.id = si.conversation_id
-                WHERE si.token LIKE ?
-                ORDER BY c.timestamp DESC
-                LIMIT ?
-            ''', (f'%{search_terms[0]}%', limit))
-        else:
-            # Multi-term search
+            logger.error("❌ Error generating embeddings: %s", e)
+        return [None] * len(texts)
+
+    def iter_search_conversations(self, query: str, limit: int = 20):
+        """Stream search hits as rows arrive instead of buffering them all"""
+        cursor = self._conn().cursor()
+
+        hit = False
+        if self.fts_available:
+            try:
+                # Ranked BM25 lookup against the FTS index - log time
+                # instead of a LIKE scan over the whole table
+                cursor.execute('''
+                    SELECT id, timestamp, session_id, prompt, response, metadata
+                    FROM conversations
+                    WHERE id IN (SELECT rowid FROM conv_fts
+                                 WHERE conv_fts MATCH ?
+                                 ORDER BY rank LIMIT ?)
+                    ORDER BY timestamp DESC
+                ''', (query, limit))
+                hit = True
+            except sqlite3.OperationalError:
+                pass  # query isn't valid FTS syntax - fall back to LIKE
+
+        if not hit:
             cursor.execute('''
-                SELECT c.id, c.timestamp, c.session_id, c.prompt, c.response, c.metadata
-                FROM conversations c 
-                WHERE c.prompt LIKE ? OR c.response LIKE ?
-                ORDER BY c.timestamp DESC
+                SELECT id, timestamp, session_id, prompt, response, metadata
+                FROM conversations
+                WHERE prompt LIKE ? OR response LIKE ?
+                ORDER BY timestamp DESC
                 LIMIT ?
             ''', (f'%{query}%', f'%{query}%', limit))
-        
-        results = []
-        for row in cursor.fetchall():
-            results.append({
+
+        # Iterating the cursor pulls rows on demand, so the first hit
+        # reaches the caller before the last is even fetched
+        for row in cursor:
+            yield {
                 'id': row[0],
                 'timestamp': row[1],
                 'session_id': row[2],
                 'prompt': row[3],
                 'response': row[4],
                 'metadata': json.loads(row[5]) if row[5] else {}
-            })
-        
-        conn.close()
-        print(f"🔍 Found {len(results)} conversations matching '{query}'")
+            }
+
+    def search_conversations(self, query: str, limit: int = 20) -> List[Dict]:
+        """Search conversations by text content"""
+        results = list(self.iter_search_conversations(query, limit))
+        logger.debug("🔍 Found %d conversations matching '%s'", len(results), query)
         return results
     
     def get_recent_conversations(self, limit: int = 10) -> List[Dict]:
         """Get most recent conversations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
+        # Truncate in SQL so only the preview crosses the SQLite/Python
+        # boundary; the extra length() columns tell us whether to add
+        # the ellipsis without fetching the full text
         cursor.execute('''
-            SELECT id, timestamp, session_id, prompt, response, metadata
-            FROM conversations 
+            SELECT id, timestamp, session_id,
+                   substr(prompt, 1, 100), length(prompt),
+                   substr(response, 1, 100), length(response),
+                   metadata
+            FROM conversations
             ORDER BY timestamp DESC
             LIMIT ?
         ''', (limit,))
-        
+
         results = []
         for row in cursor.fetchall():
             results.append({
                 'id': row[0],
                 'timestamp': row[1],
                 'session_id': row[2],
-                'prompt': row[3][:100] + "..." if len(row[3]) > 100 else row[3],
-                'response': row[4][:100] + "..." if len(row[4]) > 100 else row[4],
-                'metadata': json.loads(row[5]) if row[5] else {}
+                'prompt': row[3] + "..." if row[4] > 100 else row[3],
+                'response': row[5] + "..." if row[6] > 100 else row[5],
+                'metadata': json.loads(row[7]) if row[7] else {}
             })
-        
-        conn.close()
+
         return results
-    
+
     def get_statistics(self) -> Dict:
         """Get database statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
         
         cursor.execute('SELECT COUNT(*) FROM conversations')
         total_conversations = cursor.fetchone()[0]
@@ -228,11 +307,12 @@ class ChatHistoryManager:
         cursor.execute('SELECT COUNT(*) FROM conversation_embeddings')
         total_embeddings = cursor.fetchone()[0]
         
-        cursor.execute('SELECT COUNT(DISTINCT token) FROM search_index')
-        unique_tokens = cursor.fetchone()[0]
-        
-        conn.close()
-        
+        if self.fts_available:
+            cursor.execute('SELECT COUNT(*) FROM conv_fts_vocab')
+            unique_tokens = cursor.fetchone()[0]
+        else:
+            unique_tokens = 0
+
         return {
             'total_conversations': total_conversations,
             'total_embeddings': total_embeddings,
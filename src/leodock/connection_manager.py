@@ -1,68 +1,112 @@
+import contextlib
+import re
 import socket
 import os
 import signal
+import sys
 import time
 import psutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 class LeoDockConnectionManager:
     def __init__(self):
         self.ports = [5000, 5001]
-        self.lock_files = [f"/tmp/leodock_{port}.lock" for port in self.ports]
+        # Built once: the process-scanning loops below run these per
+        # PID, so no per-call f-string or list rebuilds there
+        self._lock_paths = {port: f"/tmp/leodock_{port}.lock" for port in self.ports}
+        self.lock_files = list(self._lock_paths.values())
         self.service_names = {5000: "terminal", 5001: "dashboard"}
+        self._browser_kw = frozenset(('chrome', 'firefox', 'browser', 'chromium'))
+        self._leodock_kw = frozenset(('localhost', '5000', '5001', 'leodock'))
+        # One compiled alternation scan per name/cmdline instead of one
+        # substring pass per keyword
+        self._browser_re = re.compile('|'.join(map(re.escape, self._browser_kw)))
+        self._leodock_re = re.compile('|'.join(map(re.escape, self._leodock_kw)))
+        self._cleanup_re = re.compile('leodock|pyxtermjs')
         
     def check_port_available(self, port):
         """Check if port is already in use"""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('127.0.0.1', port))
-        sock.close()
-        return result != 0  # True if available (connection failed)
+        # Try to bind rather than connect: no loopback handshake/RST
+        # round trip, no TIME_WAIT socket left behind, and no false
+        # "available" when a server is bound but not yet accepting
+        with contextlib.suppress(OverflowError):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                sock.settimeout(0.1)
+                try:
+                    sock.bind(('127.0.0.1', port))
+                    sock.listen(1)
+                    return True
+                except OSError:
+                    return False
+        return False  # out-of-range port can never be bound
     
+    @staticmethod
+    def _pid_alive(pid):
+        """Liveness probe via signal 0: one syscall, no Process object
+
+        psutil.pid_exists plus a Process construction reads
+        /proc/<pid>/stat for the create time; os.kill(pid, 0) asks the
+        kernel the same question directly.
+        """
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True  # exists, just owned by someone else
+
     def create_lock_file(self, port):
         """Create lock file to prevent multiple instances"""
-        lock_file = f"/tmp/leodock_{port}.lock"
-        
-        # Check if lock file exists and if process is still running
-        if os.path.exists(lock_file):
+        lock_file = self._lock_paths.get(port) or f"/tmp/leodock_{port}.lock"
+
+        # O_CREAT|O_EXCL makes the kernel do create-if-absent
+        # atomically - one syscall, and no exists/remove/open window
+        # for a concurrent launch to slip through. Two attempts: the
+        # second retries after a stale lock has been unlinked.
+        for _ in range(2):
             try:
-                with open(lock_file, 'r') as f:
-                    old_pid = int(f.read().strip())
-                
-                # Check if old process is still running
-                if psutil.pid_exists(old_pid):
+                fd = os.open(lock_file,
+                             os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                print(f"🔒 Created lock file for port {port}")
+                return True
+            except FileExistsError:
+                # Someone holds the lock - only steal it if they died
+                try:
+                    with open(lock_file, 'r') as f:
+                        old_pid = int(f.read().strip())
+
+                    if self._pid_alive(old_pid):
+                        print(f"🔒 Port {port} locked by existing process (PID: {old_pid})")
+                        return False
+
+                    # Old process is dead, remove stale lock
+                    os.remove(lock_file)
+                    print(f"🧹 Removed stale lock file for port {port}")
+
+                except (ValueError, IOError):
+                    # Invalid lock file, remove it
                     try:
-                        old_process = psutil.Process(old_pid)
-                        if old_process.is_running():
-                            print(f"🔒 Port {port} locked by existing process (PID: {old_pid})")
-                            return False
-                    except psutil.NoSuchProcess:
+                        os.remove(lock_file)
+                    except OSError:
                         pass
-                
-                # Old process is dead, remove stale lock
-                os.remove(lock_file)
-                print(f"🧹 Removed stale lock file for port {port}")
-                
-            except (ValueError, IOError):
-                # Invalid lock file, remove it
-                os.remove(lock_file)
-                print(f"🧹 Removed invalid lock file for port {port}")
-        
-        # Create new lock file
-        try:
-            with open(lock_file, 'w') as f:
-                f.write(str(os.getpid()))
-            print(f"🔒 Created lock file for port {port}")
-            return True
-        except IOError:
-            print(f"❌ Failed to create lock file for port {port}")
-            return False
+                    print(f"🧹 Removed invalid lock file for port {port}")
+            except OSError:
+                print(f"❌ Failed to create lock file for port {port}")
+                return False
+
+        return False
     
     def cleanup_locks(self):
         """Clean up lock files on exit"""
         current_pid = os.getpid()
         for port in self.ports:
-            lock_file = f"/tmp/leodock_{port}.lock"
+            lock_file = self._lock_paths[port]
             if os.path.exists(lock_file):
                 try:
                     with open(lock_file, 'r') as f:
@@ -96,79 +140,126 @@ class LeoDockConnectionManager:
         
         return True
     
+    def _probe_port(self, port):
+        """Probe one service: port state plus lock-file owner"""
+        service_name = self.service_names[port]
+        is_available = self.check_port_available(port)
+        lock_file = self._lock_paths[port]
+        has_lock = os.path.exists(lock_file)
+
+        if has_lock:
+            try:
+                with open(lock_file, 'r') as f:
+                    lock_pid = int(f.read().strip())
+                lock_info = f"PID {lock_pid}"
+
+                # Check if process is still running; psutil.Process is
+                # only constructed once we know we need the name
+                if self._pid_alive(lock_pid):
+                    try:
+                        process = psutil.Process(lock_pid)
+                        # oneshot caches the /proc read, so name()
+                        # (and any attributes added later) share a
+                        # single stat parse instead of one each
+                        with process.oneshot():
+                            lock_info += f" ({process.name()})"
+                    except psutil.NoSuchProcess:
+                        lock_info += " (dead)"
+                else:
+                    lock_info += " (dead)"
+
+            except (ValueError, IOError):
+                lock_info = "invalid"
+        else:
+            lock_info = "none"
+
+        return {
+            'port': port,
+            'name': service_name,
+            'running': not is_available,
+            'lock': lock_info
+        }
+
     def check_running_services(self):
         """Check status of all LeoDock services"""
         print(f"🔍 LeoDock Service Status - {datetime.now().strftime('%H:%M:%S')}")
         print("=" * 50)
-        
+
+        # Each probe blocks on a socket plus lock-file and /proc reads;
+        # overlapping them puts wallclock at the slowest port rather
+        # than the sum
+        with ThreadPoolExecutor(max_workers=len(self.ports)) as executor:
+            results = list(executor.map(self._probe_port, self.ports))
+
         status = {}
-        
-        for port in self.ports:
-            service_name = self.service_names[port]
-            is_available = self.check_port_available(port)
-            lock_file = f"/tmp/leodock_{port}.lock"
-            has_lock = os.path.exists(lock_file)
-            
-            if has_lock:
-                try:
-                    with open(lock_file, 'r') as f:
-                        lock_pid = int(f.read().strip())
-                    lock_info = f"PID {lock_pid}"
-                    
-                    # Check if process is still running
-                    if psutil.pid_exists(lock_pid):
-                        try:
-                            process = psutil.Process(lock_pid)
-                            lock_info += f" ({process.name()})"
-                        except psutil.NoSuchProcess:
-                            lock_info += " (dead)"
-                    else:
-                        lock_info += " (dead)"
-                        
-                except (ValueError, IOError):
-                    lock_info = "invalid"
-            else:
-                lock_info = "none"
-            
-            service_status = "🔴 Down" if is_available else "🟢 Running"
-            status[port] = {
-                'name': service_name,
-                'running': not is_available,
-                'lock': lock_info
+        # Sort by port so the printed report stays deterministic
+        for info in sorted(results, key=lambda r: r['port']):
+            status[info['port']] = {
+                'name': info['name'],
+                'running': info['running'],
+                'lock': info['lock']
             }
-            
-            print(f"{service_name.capitalize():>10}: {service_status} | Lock: {lock_info}")
-        
+
+            service_status = "🟢 Running" if info['running'] else "🔴 Down"
+            print(f"{info['name'].capitalize():>10}: {service_status} | Lock: {info['lock']}")
+
         return status
     
+    def _iter_candidate_processes(self, name_match):
+        """Yield (pid, name, cmdline) for processes whose name matches
+
+        On Linux this walks /proc directly: one short read of
+        /proc/<pid>/comm per process, and cmdline is only opened for
+        the few processes whose name actually matches. psutil's
+        process_iter parses stat and status for every PID on the box
+        just to answer the same question. Other platforms fall back
+        to process_iter.
+        """
+        if sys.platform == 'linux':
+            for entry in os.listdir('/proc'):
+                if not entry.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{entry}/comm') as f:
+                        name = f.read().strip()
+                    if not name_match(name.lower()):
+                        continue
+                    with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                        cmdline = f.read().replace(b'\0', b' ')
+                    yield int(entry), name, cmdline.decode(errors='replace').strip()
+                except OSError:
+                    pass  # process exited between listdir and read
+        else:
+            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+                try:
+                    name = proc.info['name'] or ''
+                    if not name_match(name.lower()):
+                        continue
+                    cmdline_str = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
+                    yield proc.info['pid'], name, cmdline_str
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    pass
+
     def kill_duplicate_browsers(self, keep_count=2):
         """Kill excess browser processes to prevent multiplication"""
         print(f"\n🔧 Checking for duplicate browsers (keeping {keep_count})")
-        
-        browser_processes = []
+
         leodock_browsers = []
         other_browsers = []
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                proc_name = proc.info['name'].lower()
-                if any(browser in proc_name for browser in ['chrome', 'firefox', 'browser', 'chromium']):
-                    cmdline_str = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                    
-                    browser_info = {
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'cmdline': cmdline_str
-                    }
-                    
-                    if any(keyword in cmdline_str.lower() for keyword in ['localhost', '5000', '5001', 'leodock']):
-                        leodock_browsers.append(browser_info)
-                    else:
-                        other_browsers.append(browser_info)
-                        
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        
+
+        for pid, name, cmdline_str in self._iter_candidate_processes(
+                self._browser_re.search):
+            browser_info = {
+                'pid': pid,
+                'name': name,
+                'cmdline': cmdline_str
+            }
+
+            if self._leodock_re.search(cmdline_str.lower()):
+                leodock_browsers.append(browser_info)
+            else:
+                other_browsers.append(browser_info)
+
         print(f"   LeoDock browsers: {len(leodock_browsers)}")
         print(f"   Other browsers: {len(other_browsers)}")
         
@@ -180,8 +271,12 @@ class LeoDockConnectionManager:
             for browser in leodock_browsers[keep_count:]:
                 try:
                     process = psutil.Process(browser['pid'])
-                    process.terminate()
-                    print(f"      Terminated PID {browser['pid']} ({browser['name']})")
+                    # Re-read the live name and terminate under one
+                    # cached /proc read rather than two
+                    with process.oneshot():
+                        name = process.name()
+                        process.terminate()
+                    print(f"      Terminated PID {browser['pid']} ({name})")
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
         
@@ -202,28 +297,23 @@ class LeoDockConnectionManager:
         
         # Kill any python processes related to LeoDock
         killed_processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if proc.info['name'] == 'python' or proc.info['name'] == 'python3':
-                    cmdline_str = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                    if any(keyword in cmdline_str.lower() for keyword in ['leodock', 'pyxtermjs']):
-                        if proc.info['pid'] != os.getpid():  # Don't kill ourselves!
-                            try:
-                                process = psutil.Process(proc.info['pid'])
-                                process.terminate()
-                                killed_processes.append(proc.info['pid'])
-                            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                pass
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        
+        for pid, name, cmdline_str in self._iter_candidate_processes(
+                lambda n: n in ('python', 'python3')):
+            if self._cleanup_re.search(cmdline_str.lower()):
+                if pid != os.getpid():  # Don't kill ourselves!
+                    try:
+                        process = psutil.Process(pid)
+                        process.terminate()
+                        killed_processes.append(pid)
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        pass
+
         if killed_processes:
             print(f"🗑️ Terminated LeoDock processes: {killed_processes}")
         
         print("✅ Emergency cleanup complete")
 
 if __name__ == "__main__":
-    import sys
     manager = LeoDockConnectionManager()
     
     if len(sys.argv) > 1:
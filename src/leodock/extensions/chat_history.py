@@ -1,18 +1,82 @@
 import sqlite3
 import json
+import collections
+import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict
+from functools import cached_property
+from typing import List, Dict, Optional
+
+@dataclass
+class ConvRow:
+    """Search hit whose metadata JSON decodes only on first access"""
+    id: int
+    timestamp: str
+    session_id: Optional[str]
+    prompt: str
+    response: str
+    _meta_raw: Optional[str] = None
+
+    @cached_property
+    def metadata(self) -> Dict:
+        return json.loads(self._meta_raw) if self._meta_raw else {}
+
+    def to_dict(self) -> Dict:
+        """Original dict shape for API/JSON consumers
+
+        dataclasses.asdict (what jsonify would use) emits _meta_raw
+        and never touches the lazy metadata property, so serialization
+        has to go through here.
+        """
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp,
+            'session_id': self.session_id,
+            'prompt': self.prompt,
+            'response': self.response,
+            'metadata': self.metadata
+        }
+
 
 class ChatHistoryManager:
+    # Stable SQL string so the connection's statement cache reuses the
+    # prepared insert across calls
+    _SQL_INSERT = '''
+        INSERT INTO conversations
+        (timestamp, session_id, prompt, response, llm_analysis, metadata)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+
+    FLUSH_INTERVAL = 0.1  # seconds the writer thread waits between flushes
+    FLUSH_BATCH = 64      # buffered rows that trigger an early flush
+    DUMPS_CACHE_SIZE = 256  # memoized JSON encodings of repeated dicts
+
     def __init__(self, db_path="data/conversations.db"):
         self.db_path = db_path
+        # One long-lived connection instead of an open/journal-setup/close
+        # cycle per call; WAL keeps readers off the writer's back
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-20000')
+        self.conn.execute('PRAGMA mmap_size=268435456')
+        self._lock = threading.Lock()
         self.init_database()
-    
+
+        # Write-behind buffer: saves append here and a background thread
+        # flushes them in one transaction, amortizing the commit fsync
+        self._pending = collections.deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self._dumps_cache = {}  # frozen dict -> encoded JSON string
+        self._writer = threading.Thread(target=self._flush_loop, daemon=True)
+        self._writer.start()
+
     def init_database(self):
         """Initialize SQLite database for conversation storage"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        cursor = self.conn.cursor()
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS conversations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -25,7 +89,7 @@ class ChatHistoryManager:
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS embeddings (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -34,65 +98,153 @@ class ChatHistoryManager:
                 FOREIGN KEY (conversation_id) REFERENCES conversations (id)
             )
         ''')
-        
-        cursor.execute('''
+
+        # executescript runs every statement; execute() would stop after
+        # the first one. The composite index serves recent-per-session
+        # queries with an index-only scan.
+        cursor.executescript('''
             CREATE INDEX IF NOT EXISTS idx_timestamp ON conversations(timestamp);
-        ''')
-        cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_session ON conversations(session_id);
+            CREATE INDEX IF NOT EXISTS idx_conv_session_ts ON conversations(session_id, timestamp DESC);
         ''')
-        
-        conn.commit()
-        conn.close()
-    
-    def save_conversation(self, prompt: str, response: str, session_id: str = None, 
-                         llm_analysis: Dict = None, metadata: Dict = None):
-        """Save a conversation to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO conversations 
-            (timestamp, session_id, prompt, response, llm_analysis, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
+
+        # FTS5 mirror so text search is indexed instead of a LIKE scan
+        self.fts_available = False
+        # 'rebuild' re-tokenizes the entire table, so it must only run
+        # the one time the FTS table comes into existence - probe
+        # before the CREATE to know whether this is that time
+        fts_is_new = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='conversations_fts'"
+        ).fetchone() is None
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts
+                USING fts5(prompt, response, content='conversations', content_rowid='id')
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_ai AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conversations_fts(rowid, prompt, response)
+                    VALUES (new.id, new.prompt, new.response);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_ad AFTER DELETE ON conversations BEGIN
+                    INSERT INTO conversations_fts(conversations_fts, rowid, prompt, response)
+                    VALUES ('delete', old.id, old.prompt, old.response);
+                END
+            ''')
+            # Backfill rows that predate the FTS table, once; the
+            # triggers keep it current from here on
+            if fts_is_new:
+                cursor.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('rebuild')")
+            self.fts_available = True
+        except sqlite3.OperationalError:
+            pass  # SQLite built without FTS5 - LIKE fallback still works
+
+        self.conn.commit()
+
+    def save_conversation(self, prompt: str, response: str, session_id: str = None,
+                         llm_analysis: Dict = None, metadata: Dict = None) -> None:
+        """Buffer a conversation; the background writer persists it shortly
+
+        Returns None: the rowid is assigned by SQLite at flush time,
+        and other writers (chat_history_manager shares this table and
+        database) can interleave inserts, so a predicted id here could
+        not be trusted. Callers that need the persisted row should call
+        flush() and query for it.
+        """
+        row = (
             datetime.now().isoformat(),
             session_id,
             prompt,
             response,
-            json.dumps(llm_analysis) if llm_analysis else None,
-            json.dumps(metadata) if metadata else None
-        ))
-        
-        conversation_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return conversation_id
-    
-    def search_conversations(self, query: str, limit: int = 50) -> List[Dict]:
+            self._dumps_cached(llm_analysis),
+            self._dumps_cached(metadata)
+        )
+        with self._lock:
+            self._pending.append(row)
+        if len(self._pending) >= self.FLUSH_BATCH:
+            self._wake.set()
+
+    @staticmethod
+    def _freeze(value):
+        """Recursively convert dicts/lists into hashable tuples"""
+        if isinstance(value, dict):
+            return tuple(sorted(
+                (k, ChatHistoryManager._freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(ChatHistoryManager._freeze(v) for v in value)
+        return value
+
+    def _dumps_cached(self, obj):
+        """JSON-encode a dict, reusing the encoding for repeated payloads"""
+        if not obj:
+            return None
+        try:
+            key = self._freeze(obj)
+        except TypeError:
+            return json.dumps(obj)  # unhashable leaf - encode directly
+        cached = self._dumps_cache.get(key)
+        if cached is None:
+            cached = json.dumps(obj)
+            if len(self._dumps_cache) >= self.DUMPS_CACHE_SIZE:
+                self._dumps_cache.pop(next(iter(self._dumps_cache)))
+            self._dumps_cache[key] = cached
+        return cached
+
+    def _flush_loop(self):
+        """Background writer: drain the buffer every FLUSH_INTERVAL"""
+        while not self._closed:
+            self._wake.wait(timeout=self.FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all buffered conversations out in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = list(self._pending)
+            self._pending.clear()
+            self.conn.executemany(self._SQL_INSERT, rows)
+            self.conn.commit()
+
+    def close(self):
+        """Flush pending writes and stop the background writer"""
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=1)
+        self.flush()
+
+    def search_conversations(self, query: str, limit: int = 50) -> List[ConvRow]:
         """Search conversations by text content"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        self.flush()  # read-your-writes for anything still buffered
+        cursor = self.conn.cursor()
+
+        if self.fts_available:
+            try:
+                cursor.execute('''
+                    SELECT c.id, c.timestamp, c.session_id, c.prompt, c.response, c.metadata
+                    FROM conversations_fts f
+                    JOIN conversations c ON c.id = f.rowid
+                    WHERE conversations_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ''', (query, limit))
+                return self._build_results(cursor.fetchall())
+            except sqlite3.OperationalError:
+                pass  # Query not valid FTS syntax - fall back to LIKE
+
         cursor.execute('''
             SELECT id, timestamp, session_id, prompt, response, metadata
-            FROM conversations 
+            FROM conversations
             WHERE prompt LIKE ? OR response LIKE ?
             ORDER BY timestamp DESC
             LIMIT ?
         ''', (f'%{query}%', f'%{query}%', limit))
-        
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'id': row[0],
-                'timestamp': row[1],
-                'session_id': row[2],
-                'prompt': row[3],
-                'response': row[4],
-                'metadata': json.loads(row[5]) if row[5] else {}
-            })
-        
-        conn.close()
-        return results
\ No newline at end of file
+
+        return self._build_results(cursor.fetchall())
+
+    def _build_results(self, rows) -> List[ConvRow]:
+        """Wrap database rows; metadata stays raw until a caller reads it"""
+        return [ConvRow(*row) for row in rows]
@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import sqlite3
 import asyncio
 from datetime import datetime
@@ -13,20 +14,50 @@ class LLMManager:
         }
         self.fallback_api_key = None  # Set from config
         self.conversations = []
-        
+        # Shared keep-alive session; the blocking posts run on worker
+        # threads so asyncio.gather genuinely overlaps them
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        # Pre-serialize the constant payload parts (model, system prompt,
+        # sampling settings) so each call only encodes the user message
+        self._indexing_tmpl = self._build_template(
+            self.models['indexing'],
+            "You are IndexingLLM. You specialize in code analysis, embedding generation, and knowledge management.",
+            0.7)
+        self._quality_tmpl = self._build_template(
+            self.models['quality'],
+            "You are QualityLLM. You analyze code quality, detect drift, and ensure consistency.",
+            0.3)
+
+    @staticmethod
+    def _build_template(model, system_content, temperature):
+        """Split a payload around a user-content placeholder for splicing"""
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_content},
+                {"role": "user", "content": "\x00"}
+            ],
+            "temperature": temperature,
+            "max_tokens": 1000
+        }
+        prefix, suffix = json.dumps(payload).split('"\\u0000"')
+        return prefix, suffix
+
+    def _spliced_body(self, template, user_content):
+        """Encode only the variable user message into the cached template"""
+        prefix, suffix = template
+        return (prefix + json.dumps(user_content) + suffix).encode()
+
     async def send_to_indexing_llm(self, prompt, context=""):
         """Send prompt to IndexingLLM for embedding/search tasks"""
         try:
-            response = requests.post(f"{self.lm_studio_url}/chat/completions", 
-                json={
-                    "model": self.models['indexing'],
-                    "messages": [
-                        {"role": "system", "content": "You are IndexingLLM. You specialize in code analysis, embedding generation, and knowledge management."},
-                        {"role": "user", "content": f"Context: {context}\n\nTask: {prompt}"}
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 1000
-                })
+            body = self._spliced_body(self._indexing_tmpl,
+                                      f"Context: {context}\n\nTask: {prompt}")
+            response = await asyncio.to_thread(
+                self.session.post, f"{self.lm_studio_url}/chat/completions",
+                data=body, headers={'Content-Type': 'application/json'},
+                timeout=30)
             return response.json()
         except Exception as e:
             return {"error": f"IndexingLLM error: {str(e)}"}
@@ -34,16 +65,12 @@ class LLMManager:
     async def send_to_quality_llm(self, prompt, context=""):
         """Send prompt to QualityLLM for analysis and QA"""
         try:
-            response = requests.post(f"{self.lm_studio_url}/chat/completions", 
-                json={
-                    "model": self.models['quality'],
-                    "messages": [
-                        {"role": "system", "content": "You are QualityLLM. You analyze code quality, detect drift, and ensure consistency."},
-                        {"role": "user", "content": f"Context: {context}\n\nAnalyze: {prompt}"}
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 1000
-                })
+            body = self._spliced_body(self._quality_tmpl,
+                                      f"Context: {context}\n\nAnalyze: {prompt}")
+            response = await asyncio.to_thread(
+                self.session.post, f"{self.lm_studio_url}/chat/completions",
+                data=body, headers={'Content-Type': 'application/json'},
+                timeout=30)
             return response.json()
         except Exception as e:
             return {"error": f"QualityLLM error: {str(e)}"}
@@ -4,13 +4,16 @@ LeoDock Platform - Complete Demo
 Demonstrates all implemented features of the Claude Code integration platform
 """
 
-import time
+import asyncio
 from chat_history_manager import ChatHistoryManager
 from llm_collaboration import LeoDockTeam
 from llm_hub import LLMCommunicationHub
 from llm_commands import LLMCommands
 
-def main():
+# Cap concurrent LLM calls so the local LM Studio isn't oversubscribed
+LLM_CONCURRENCY = 4
+
+async def main():
     print("🦁" * 20)
     print("🦁 LEODOCK PLATFORM - COMPLETE DEMO")
     print("🦁" * 20)
@@ -30,48 +33,52 @@ def main():
     print("FEATURE 1: Individual LLM Communication")
     print("=" * 60)
     
-    # Test individual communication
-    print("\n📞 Testing Leo communication:")
+    # Independent LLM round-trips overlap on worker threads; results are
+    # printed once both finish so the demo narration stays ordered
+    sem = asyncio.Semaphore(LLM_CONCURRENCY)
+
+    async def llm_call(fn, *args):
+        async with sem:
+            return await asyncio.to_thread(fn, *args)
+
     import talk_to_leo
-    leo_response = talk_to_leo.talk_to_leo("Demo: LeoDock platform is fully operational!")
+    import talk_to_archie
+    leo_response, archie_response = await asyncio.gather(
+        llm_call(talk_to_leo.talk_to_leo, "Demo: LeoDock platform is fully operational!"),
+        llm_call(talk_to_archie.ask_archie_for_embeddings, "LeoDock semantic analysis test")
+    )
+    print("\n📞 Testing Leo communication:")
     print(f"Leo: {leo_response[:100]}...")
     
     print("\n📊 Testing Archie communication:")
-    import talk_to_archie
-    archie_response = talk_to_archie.ask_archie_for_embeddings("LeoDock semantic analysis test")
     print(f"Archie: {archie_response}")
     
-    time.sleep(1)
-    
     print("\n" + "=" * 60)
     print("FEATURE 2: Three-Way AI Collaboration")
     print("=" * 60)
     
     print("\n🤝 Demonstrating collaborative analysis:")
-    team.collaborate_on_task("Optimize LeoDock platform performance and add new features")
-    
-    time.sleep(1)
+    await llm_call(team.collaborate_on_task,
+                   "Optimize LeoDock platform performance and add new features")
     
     print("\n" + "=" * 60)
     print("FEATURE 3: LLM Communication Hub")
     print("=" * 60)
     
     print("\n🔄 Testing LLM-to-LLM communication:")
-    hub.leo_to_archie("Demo: Process this text for semantic search capabilities")
-    
-    time.sleep(1)
+    await llm_call(hub.leo_to_archie,
+                   "Demo: Process this text for semantic search capabilities")
     
     print("\n" + "=" * 60)
     print("FEATURE 4: Unix-Style Commands")
     print("=" * 60)
     
-    print("\n📝 Testing write command:")
-    commands.llm_write("leo", "Demo message via Unix-style write command")
-    
-    print("\n📢 Testing wall broadcast:")
-    commands.llm_wall("Demo broadcast: LeoDock platform operational!")
-    
-    time.sleep(1)
+    # write and wall target different LLMs, so let them overlap too
+    print("\n📝 Testing write command + wall broadcast:")
+    await asyncio.gather(
+        llm_call(commands.llm_write, "leo", "Demo message via Unix-style write command"),
+        llm_call(commands.llm_wall, "Demo broadcast: LeoDock platform operational!")
+    )
     
     print("\n" + "=" * 60)
     print("FEATURE 5: Chat History & Analytics")
@@ -120,4 +127,4 @@ def main():
 """)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,12 +1,22 @@
 import psutil
 import requests
+import re
 import time
 import subprocess
+import select
 import sys
+import os
 from datetime import datetime
 from advanced_chat_history import AdvancedChatHistory
 
 class LeoDockMonitor:
+    # Hoisted match sets - built once, not per process per tick. The
+    # compiled alternations scan a multi-KB cmdline in one pass with no
+    # lowercase copy, instead of one substring search per keyword.
+    BROWSER_NAMES = ('chrome', 'firefox', 'browser', 'chromium')
+    LEO_PATTERN = re.compile('localhost|5000|5001|leodock', re.IGNORECASE)
+    LEO_PY_PATTERN = re.compile('leodock|pyxtermjs|talk_to_leo|llm_|chat_history', re.IGNORECASE)
+
     def __init__(self):
         self.services = {
             'terminal': 'http://127.0.0.1:5000',
@@ -15,6 +25,9 @@ class LeoDockMonitor:
         }
         self.chat_history = AdvancedChatHistory()
         self.alerts = []
+        # pid -> classification cached between ticks; a process keeps its
+        # identity for its lifetime so cmdline is only read once per PID
+        self._proc_class = {}
         
     def check_service_health(self):
         """Check health of all LeoDock services"""
@@ -60,11 +73,8 @@ class LeoDockMonitor:
         if disk.percent > 90:
             self.alerts.append(f"High disk usage: {disk.percent:.1f}%")
         
-        # Check for browser processes
-        browser_processes = self._check_browser_processes()
-        
-        # Check for Python processes related to LeoDock
-        leodock_processes = self._check_leodock_processes()
+        # One pass over /proc feeds both tallies
+        browser_processes, leodock_processes = self._scan_processes()
         
         print(f"\n📊 Process Summary:")
         print(f"Browser processes: {browser_processes['count']} {'⚠️' if browser_processes['count'] > 3 else '✅'}")
@@ -85,33 +95,98 @@ class LeoDockMonitor:
             'alerts': self.alerts.copy()
         }
     
+    def _iter_proc_names(self):
+        """Yield (pid, name) pairs cheaply: one comm read per PID on Linux"""
+        if not os.path.isdir('/proc'):
+            for proc in psutil.process_iter(['pid', 'name']):
+                yield proc.info['pid'], proc.info['name'] or ''
+            return
+        for entry in os.scandir('/proc'):
+            if not entry.name.isdigit():
+                continue
+            # Raw open/read/close: three syscalls per PID and no buffered
+            # file object churn on a walk that touches hundreds of entries
+            try:
+                fd = os.open(f'/proc/{entry.name}/comm', os.O_RDONLY)
+            except OSError:
+                continue  # process exited or is not ours
+            try:
+                name = os.read(fd, 32).rstrip(b'\n\x00').decode()
+            except OSError:
+                continue
+            finally:
+                os.close(fd)
+            yield int(entry.name), name
+
     def _check_browser_processes(self):
         """Check browser processes for multiplication issues"""
+        return self._scan_processes()[0]
+
+    def _check_leodock_processes(self):
+        """Check LeoDock-related Python processes"""
+        return self._scan_processes()[1]
+
+    def _scan_processes(self):
+        """Single walk over the process table: classify browsers and
+        LeoDock Python processes, tallying while filtering"""
         browsers = {'leodock': [], 'other': [], 'count': 0}
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'memory_info']):
+        processes = {'count': 0, 'details': []}
+        seen_pids = set()
+
+        for pid, name in self._iter_proc_names():
             try:
-                proc_name = proc.info['name'].lower()
-                if any(browser in proc_name for browser in ['chrome', 'firefox', 'browser', 'chromium']):
-                    cmdline_str = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                    memory_mb = proc.info['memory_info'].rss // 1024**2
-                    
-                    browser_info = {
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'memory': memory_mb,
-                        'cmdline': cmdline_str[:100]
-                    }
-                    
-                    if any(keyword in cmdline_str.lower() for keyword in ['localhost', '5000', '5001', 'leodock']):
-                        browsers['leodock'].append(browser_info)
-                    else:
-                        browsers['other'].append(browser_info)
-                    
-                    browsers['count'] += 1
-                    
+                seen_pids.add(pid)
+
+                if name in ('python', 'python3'):
+                    proc = psutil.Process(pid)
+                    # oneshot caches the /proc reads shared by these attrs
+                    with proc.oneshot():
+                        info = proc.as_dict(attrs=['cmdline', 'memory_info', 'cpu_percent'])
+                    cmdline_str = ' '.join(info['cmdline']) if info['cmdline'] else ''
+                    if self.LEO_PY_PATTERN.search(cmdline_str):
+                        processes['details'].append({
+                            'pid': pid,
+                            'memory': info['memory_info'].rss // 1024**2,
+                            'cpu': info['cpu_percent'],
+                            'cmdline': cmdline_str[:80]
+                        })
+                        processes['count'] += 1
+                    continue
+
+                cached = self._proc_class.get(pid)
+                if cached is None or cached['name'] != name:
+                    proc_name = name.lower()
+                    if not any(browser in proc_name for browser in self.BROWSER_NAMES):
+                        self._proc_class[pid] = {'name': name, 'kind': None}
+                        continue
+                    # Only name matches pay for the full cmdline read
+                    proc = psutil.Process(pid)
+                    with proc.oneshot():
+                        cmdline_str = ' '.join(proc.cmdline())
+                    kind = 'leodock' if self.LEO_PATTERN.search(cmdline_str) else 'other'
+                    cached = {'name': name, 'kind': kind, 'cmdline': cmdline_str[:100]}
+                    self._proc_class[pid] = cached
+
+                if cached['kind'] is None:
+                    continue
+
+                # Memory changes every tick; classification does not
+                browser_info = {
+                    'pid': pid,
+                    'name': cached['name'],
+                    'memory': psutil.Process(pid).memory_info().rss // 1024**2,
+                    'cmdline': cached['cmdline']
+                }
+                browsers[cached['kind']].append(browser_info)
+                browsers['count'] += 1
+
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
+
+        # Forget processes that have exited so PIDs can be reused safely;
+        # one set difference instead of testing every cached PID
+        for pid in self._proc_class.keys() - seen_pids:
+            del self._proc_class[pid]
         
         # Check for excessive browsers
         if browsers['count'] > 5:
@@ -120,41 +195,16 @@ class LeoDockMonitor:
         if len(browsers['other']) > 3:
             self.alerts.append(f"Too many non-LeoDock browsers: {len(browsers['other'])}")
         
-        return browsers
-    
-    def _check_leodock_processes(self):
-        """Check LeoDock-related Python processes"""
-        processes = {'count': 0, 'details': []}
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'memory_info', 'cpu_percent']):
-            try:
-                if proc.info['name'] in ['python', 'python3']:
-                    cmdline_str = ' '.join(proc.info['cmdline']) if proc.info['cmdline'] else ''
-                    if any(keyword in cmdline_str.lower() for keyword in ['leodock', 'pyxtermjs', 'talk_to_leo', 'llm_', 'chat_history']):
-                        memory_mb = proc.info['memory_info'].rss // 1024**2
-                        
-                        process_info = {
-                            'pid': proc.info['pid'],
-                            'memory': memory_mb,
-                            'cpu': proc.info['cpu_percent'],
-                            'cmdline': cmdline_str[:80]
-                        }
-                        
-                        processes['details'].append(process_info)
-                        processes['count'] += 1
-                        
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        
-        return processes
+        return browsers, processes
     
-    def auto_fix_issues(self):
+    def auto_fix_issues(self, browser_processes=None, leodock_processes=None):
         """Automatically fix common issues"""
         print("\n🔧 Auto-fixing common issues...")
         fixes_applied = []
         
-        # Kill excessive browser processes
-        browser_processes = self._check_browser_processes()
+        # Reuse scan results when the caller already has them
+        if browser_processes is None or leodock_processes is None:
+            browser_processes, leodock_processes = self._scan_processes()
         
         if len(browser_processes['other']) > 3:
             print(f"🗑️ Killing {len(browser_processes['other']) - 2} excess non-LeoDock browsers")
@@ -172,7 +222,6 @@ class LeoDockMonitor:
                 print(f"   ✅ Terminated {killed_count} excess browsers")
         
         # Check for zombie LeoDock processes
-        leodock_processes = self._check_leodock_processes()
         high_memory_processes = [p for p in leodock_processes['details'] if p['memory'] > 500]  # > 500MB
         
         if high_memory_processes:
@@ -212,7 +261,9 @@ class LeoDockMonitor:
         print("🦁 Running health check with Leo's analysis...")
         
         health_data = self.check_service_health()
-        auto_fixes = self.auto_fix_issues()
+        auto_fixes = self.auto_fix_issues(
+            health_data['processes']['browsers'],
+            health_data['processes']['leodock'])
         
         # Prepare health summary for Leo
         health_summary = f"""
@@ -254,7 +305,16 @@ class LeoDockMonitor:
         """Run continuous monitoring"""
         print(f"🔄 Starting continuous monitoring (interval: {interval}s)")
         print("Press Ctrl+C to stop monitoring")
-        
+
+        # timerfd (Python 3.13+) keeps the period exact regardless of how
+        # long each health check takes; the fallback schedules against
+        # monotonic deadlines instead of sleeping a fixed interval
+        tfd = None
+        if hasattr(os, 'timerfd_create'):
+            tfd = os.timerfd_create(time.CLOCK_MONOTONIC)
+            os.timerfd_settime(tfd, initial=interval, interval=interval)
+        next_tick = time.monotonic() + interval
+
         try:
             while True:
                 health_data = self.run_health_check_with_leo()
@@ -272,7 +332,16 @@ class LeoDockMonitor:
                 print(f"Next check in {interval} seconds...")
                 print(f"{'='*60}\n")
                 
-                time.sleep(interval)
+                if tfd is not None:
+                    select.select([tfd], [], [])
+                    os.read(tfd, 8)  # acknowledge expirations to rearm
+                else:
+                    next_tick += interval
+                    delay = next_tick - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        next_tick = time.monotonic() + interval  # check overran; resync
                 
         except KeyboardInterrupt:
             print(f"\n🛑 Monitoring stopped by user")
@@ -280,6 +349,9 @@ class LeoDockMonitor:
             # Final cleanup
             self.auto_fix_issues()
             print("✅ Final cleanup completed")
+        finally:
+            if tfd is not None:
+                os.close(tfd)
 
 def main():
     monitor = LeoDockMonitor()
@@ -1,40 +1,153 @@
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import json
+import os
 import sys
 
+import numpy as np
+
 class LeoDockTeam:
-    def __init__(self):
+    SEMANTIC_CACHE_THRESHOLD = 0.92  # cosine similarity counted as a repeat
+    SEMANTIC_CACHE_MAX = 256  # cached answers kept (oldest evicted first)
+
+    def __init__(self, cache_path="data/leo_semantic_cache.json"):
         self.base_url = "http://127.0.0.1:1234/v1"
+        # Pooled keep-alive session shared by Leo and Archie calls.
+        # LM Studio serves plain HTTP/1.1 on loopback, so concurrent
+        # Leo/Archie requests ride separate pooled sockets - on
+        # localhost that buys the same parallelism HTTP/2 stream
+        # multiplexing would, without a new client dependency.
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
+        # Semantic cache: paraphrased repeats of a question reuse Leo's
+        # earlier answer instead of paying another chat completion.
+        # Persisted as JSON so it survives restarts; capped at
+        # SEMANTIC_CACHE_MAX entries with oldest-first eviction.
+        self._leo_cache_path = cache_path
+        self._leo_cache_vecs = []
+        self._leo_cache_answers = []
+        self._leo_cache_mat = None  # stacked copy, rebuilt after appends
+        self._load_leo_cache()
+        # Fixed parts of the chat payload, built once: each ask_leo call
+        # only allocates the user message and a shallow merge
+        self._sys_msg = {"role": "system", "content": "You are Leo in LeoDock. Work with Claude Code and Archie to solve problems. Be concise and helpful."}
+        self._base_payload = {
+            "model": "meta-llama-3.1-8b-instruct",
+            "temperature": 0.7,
+            "max_tokens": 300
+        }
         
-    def ask_leo(self, question, context=""):
-        """Chat with Leo for reasoning and analysis"""
-        response = requests.post(f"{self.base_url}/chat/completions", 
+    def _load_leo_cache(self):
+        """Load the persisted semantic cache, if one exists"""
+        try:
+            with open(self._leo_cache_path) as f:
+                data = json.load(f)
+            self._leo_cache_vecs = [np.asarray(v, dtype=np.float32)
+                                    for v in data['vectors']]
+            self._leo_cache_answers = data['answers']
+        except (OSError, ValueError, KeyError):
+            pass  # no cache yet, or unreadable - start empty
+
+    def _save_leo_cache(self):
+        """Persist the semantic cache so it survives restarts"""
+        try:
+            os.makedirs(os.path.dirname(self._leo_cache_path) or '.', exist_ok=True)
+            tmp_path = self._leo_cache_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'vectors': [v.tolist() for v in self._leo_cache_vecs],
+                           'answers': self._leo_cache_answers}, f)
+            os.replace(tmp_path, self._leo_cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not persist Leo cache: {e}")
+
+    def _leo_cache_matrix(self):
+        """Stacked cache vectors, rebuilt only when the cache changed"""
+        if (self._leo_cache_mat is None
+                or len(self._leo_cache_mat) != len(self._leo_cache_vecs)):
+            self._leo_cache_mat = np.vstack(self._leo_cache_vecs)
+        return self._leo_cache_mat
+
+    def _embed(self, text):
+        """Fetch one Archie embedding as a unit float32 vector"""
+        response = self.session.post(f"{self.base_url}/embeddings",
+            json={
+                "model": "text-embedding-nomic-embed-text-v1.5-embedding",
+                "input": text
+            })
+        if response.status_code != 200:
+            return None
+        vec = np.asarray(response.json()['data'][0]['embedding'], dtype=np.float32)
+        vec /= np.linalg.norm(vec) + 1e-12
+        return vec
+
+    def ask_leo(self, question, context="", threshold=None, query_vec=None):
+        """Chat with Leo for reasoning and analysis (semantically cached)
+
+        Callers that already hold a unit vector for the question (e.g.
+        collaborate_on_task, which embeds the task via Archie anyway)
+        can pass it as query_vec to skip the extra embedding round trip.
+        """
+        if threshold is None:
+            threshold = self.SEMANTIC_CACHE_THRESHOLD
+        if query_vec is None:
+            try:
+                query_vec = self._embed(question)
+            except requests.RequestException:
+                query_vec = None
+        if query_vec is not None and self._leo_cache_vecs:
+            sims = self._leo_cache_matrix() @ query_vec
+            best = int(np.argmax(sims))
+            if sims[best] > threshold:
+                return self._leo_cache_answers[best]
+
+        response = self.session.post(f"{self.base_url}/chat/completions",
             json={
-                "model": "meta-llama-3.1-8b-instruct",
+                **self._base_payload,
                 "messages": [
-                    {"role": "system", "content": "You are Leo in LeoDock. Work with Claude Code and Archie to solve problems. Be concise and helpful."},
+                    self._sys_msg,
                     {"role": "user", "content": f"Context: {context}\n\nQuestion: {question}"}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 300
+                ]
             })
         
         if response.status_code == 200:
-            return response.json()['choices'][0]['message']['content']
+            answer = response.json()['choices'][0]['message']['content']
+            if query_vec is not None:
+                self._leo_cache_vecs.append(query_vec)
+                self._leo_cache_answers.append(answer)
+                if len(self._leo_cache_vecs) > self.SEMANTIC_CACHE_MAX:
+                    self._leo_cache_vecs.pop(0)
+                    self._leo_cache_answers.pop(0)
+                self._leo_cache_mat = None  # stale; rebuilt on next probe
+                self._save_leo_cache()
+            return answer
         return f"Leo error: {response.status_code}"
     
     def ask_archie(self, text):
-        """Get embeddings from Archie for semantic analysis"""
-        response = requests.post(f"{self.base_url}/embeddings",
+        """Get embeddings from Archie; accepts one text or a whole batch
+
+        Returns contiguous float32 arrays (one per input) rather than
+        lists of Python floats - ~3 KB per vector instead of ~22 KB,
+        and similarity math downstream becomes a single np.dot.
+        """
+        texts = text if isinstance(text, list) else [text]
+        response = self.session.post(f"{self.base_url}/embeddings",
             json={
                 "model": "text-embedding-nomic-embed-text-v1.5-embedding",
-                "input": text
+                "input": texts  # one round trip regardless of batch size
             })
-        
+
         if response.status_code == 200:
-            embedding = response.json()['data'][0]['embedding']
-            return len(embedding), embedding[:5]  # Return length and first 5 values
-        return None, f"Archie error: {response.status_code}"
+            data = sorted(response.json()['data'], key=lambda item: item['index'])
+            embeddings = [np.asarray(item['embedding'], dtype=np.float32)
+                          for item in data]
+            if isinstance(text, list):
+                return embeddings
+            return embeddings[0]
+        print(f"Archie error: {response.status_code}")
+        return None
     
     def collaborate_on_task(self, task_description):
         """All three AIs work together on a task"""
@@ -46,19 +159,29 @@ class LeoDockTeam:
         print(f"\n🤖 Claude Code Analysis:")
         print(f"I'll analyze this task and coordinate with Leo and Archie...")
         
+        # One Archie round trip serves both the semantic analysis and
+        # ask_leo's cache probe; previously each embedded the task
+        # separately, so the common cache-miss case paid twice
+        embedding = self.ask_archie(task_description)
+        query_vec = None
+        if embedding is not None:
+            query_vec = embedding / (np.linalg.norm(embedding) + 1e-12)
+
+        leo_response = self.ask_leo(
+            f"Analyze this development task: {task_description}",
+            query_vec=query_vec)
+
         # Get Leo's perspective
         print(f"\n🦁 Leo's Analysis:")
-        leo_response = self.ask_leo(f"Analyze this development task: {task_description}")
         print(f"Leo: {leo_response}")
-        
+
         # Get Archie's semantic analysis
         print(f"\n🔍 Archie's Semantic Analysis:")
-        embedding_len, embedding_sample = self.ask_archie(task_description)
-        if embedding_len:
-            print(f"Archie: Generated {embedding_len}-dimensional embedding")
-            print(f"Archie: Sample values: {embedding_sample}")
+        if embedding is not None:
+            print(f"Archie: Generated {embedding.shape[0]}-dimensional embedding")
+            print(f"Archie: Sample values: {embedding[:5].tolist()}")
         else:
-            print(f"Archie: {embedding_sample}")
+            print(f"Archie: embedding request failed")
         
         print(f"\n✅ Team collaboration complete!")
 
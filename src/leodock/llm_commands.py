@@ -5,6 +5,7 @@ Implements talk, write, wall, and screen commands for LLM interaction
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 import time
@@ -14,6 +15,9 @@ from chat_history_manager import ChatHistoryManager
 class LLMCommands:
     def __init__(self):
         self.base_url = "http://127.0.0.1:1234/v1"
+        # Shared keep-alive session: one TCP connection across calls
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
         self.chat_manager = ChatHistoryManager()
         self.active_sessions = {}
         self.message_queue = []
@@ -184,7 +188,7 @@ class LLMCommands:
     def _send_to_leo(self, message):
         """Send message to Leo (chat LLM)"""
         try:
-            response = requests.post(f"{self.base_url}/chat/completions", 
+            response = self.session.post(f"{self.base_url}/chat/completions", 
                 json={
                     "model": "meta-llama-3.1-8b-instruct",
                     "messages": [
@@ -204,7 +208,7 @@ class LLMCommands:
     def _send_to_archie(self, message):
         """Send message to Archie (embedding LLM) - simulate response"""
         try:
-            response = requests.post(f"{self.base_url}/embeddings",
+            response = self.session.post(f"{self.base_url}/embeddings",
                 json={
                     "model": "text-embedding-nomic-embed-text-v1.5-embedding",
                     "input": message
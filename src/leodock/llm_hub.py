@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 from chat_history_manager import ChatHistoryManager
@@ -6,6 +7,9 @@ from chat_history_manager import ChatHistoryManager
 class LLMCommunicationHub:
     def __init__(self):
         self.base_url = "http://127.0.0.1:1234/v1"
+        # Shared keep-alive session: one TCP connection across calls
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
         self.message_history = []
         self.chat_manager = ChatHistoryManager()
     
@@ -68,7 +72,7 @@ class LLMCommunicationHub:
     def ask_archie_for_embedding(self, text):
         """Get embeddings from Archie"""
         try:
-            response = requests.post(f"{self.base_url}/embeddings",
+            response = self.session.post(f"{self.base_url}/embeddings",
                 json={"model": "text-embedding-nomic-embed-text-v1.5-embedding", "input": text})
             
             if response.status_code == 200:
@@ -81,7 +85,7 @@ class LLMCommunicationHub:
     def ask_leo(self, question):
         """Send question to Leo"""
         try:
-            response = requests.post(f"{self.base_url}/chat/completions", 
+            response = self.session.post(f"{self.base_url}/chat/completions", 
                 json={
                     "model": "meta-llama-3.1-8b-instruct",
                     "messages": [
@@ -100,7 +104,7 @@ class LLMCommunicationHub:
     
     def ask_leo_about_embedding(self, original_text, embedding_length):
         """Ask Leo to analyze embedding results"""
-        response = requests.post(f"{self.base_url}/chat/completions", 
+        response = self.session.post(f"{self.base_url}/chat/completions", 
             json={
                 "model": "meta-llama-3.1-8b-instruct",
                 "messages": [
@@ -3,38 +3,82 @@
 Start LM Studio server via CLI and test connection
 """
 
-import subprocess
+import asyncio
+import re
 import time
 import requests
 import json
 import os
 from pathlib import Path
 
+# Success sentinels compiled once: each covers all of its step's
+# acceptable phrasings in a single alternation, so the streaming loop
+# does one regex scan per line instead of one substring pass per phrase
+SERVER_READY_PATTERN = re.compile(r"running|started|Success", re.IGNORECASE)
+MODEL_LOADED_PATTERN = re.compile(r"loaded|Success", re.IGNORECASE)
+
+
+async def stream_command(cmd, sentinel, timeout):
+    """Run a command, scanning stdout line-by-line for a sentinel
+
+    Short-circuits the moment the sentinel pattern appears instead of
+    buffering the full output and substring-matching it afterwards.
+    Returns (ok, matched) where ok reflects the exit status when the
+    process ran to completion.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT)
+
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            line = await asyncio.wait_for(proc.stdout.readline(), remaining)
+            if not line:
+                break  # EOF - fall through to exit status
+            if sentinel.search(line.decode(errors='replace')):
+                return True, True
+        return await proc.wait() == 0, False
+    finally:
+        if proc.returncode is None:
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), 5)
+            except asyncio.TimeoutError:
+                proc.kill()
+
 
 def start_lmstudio_server():
     """Start LM Studio server in background"""
-    
+
     lms_path = Path.home() / ".lmstudio" / "bin" / "lms"
-    
+
     if not lms_path.exists():
         print(f"❌ LM Studio CLI not found at {lms_path}")
         return False
-    
+
     try:
         print("🚀 Starting LM Studio server...")
-        
-        # Try to start server in background
-        result = subprocess.run([str(lms_path), "server", "start", "--host", "0.0.0.0", "--port", "1234"], 
-                              capture_output=True, text=True, timeout=10)
-        
-        if result.returncode != 0:
-            print(f"❌ Failed to start server: {result.stderr}")
+
+        # Stream the CLI output and return as soon as it reports the
+        # server is up, instead of blocking for the full command
+        ok, _ = asyncio.run(stream_command(
+            [str(lms_path), "server", "start", "--host", "0.0.0.0", "--port", "1234"],
+            sentinel=SERVER_READY_PATTERN,
+            timeout=10))
+
+        if not ok:
+            print("❌ Failed to start server")
             return False
-            
+
         print("✅ Server start command executed")
         return True
-        
-    except subprocess.TimeoutExpired:
+
+    except asyncio.TimeoutError:
         print("⏰ Server start command timed out (this might be normal)")
         return True
     except Exception as e:
@@ -44,26 +88,28 @@ def start_lmstudio_server():
 
 def load_model():
     """Load a model in LM Studio"""
-    
+
     lms_path = Path.home() / ".lmstudio" / "bin" / "lms"
-    
+
     # Try to load the Llama model we found
     model_path = "lmstudio-community/Meta-Llama-3.1-8B-Instruct-GGUF"
-    
+
     try:
         print(f"📦 Loading model: {model_path}")
-        
-        result = subprocess.run([str(lms_path), "load", model_path], 
-                              capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
+
+        ok, _ = asyncio.run(stream_command(
+            [str(lms_path), "load", model_path],
+            sentinel=MODEL_LOADED_PATTERN,
+            timeout=30))
+
+        if ok:
             print("✅ Model loaded successfully")
             return True
         else:
-            print(f"❌ Failed to load model: {result.stderr}")
+            print("❌ Failed to load model")
             return False
-            
-    except subprocess.TimeoutExpired:
+
+    except asyncio.TimeoutError:
         print("⏰ Model loading timed out")
         return False
     except Exception as e:
@@ -73,15 +119,15 @@ def load_model():
 
 def test_api_connection():
     """Test API connection to LM Studio"""
-    
+
     base_url = "http://localhost:1234"
-    
+
     try:
         print("🔍 Testing API connection...")
-        
+
         # Test health endpoint
         response = requests.get(f"{base_url}/v1/models", timeout=5)
-        
+
         if response.status_code == 200:
             models = response.json()
             print(f"✅ API connection successful!")
@@ -90,7 +136,7 @@ def test_api_connection():
         else:
             print(f"❌ API connection failed: {response.status_code}")
             return False
-            
+
     except requests.ConnectionError:
         print("❌ Could not connect to LM Studio API")
         return False
@@ -101,42 +147,42 @@ def test_api_connection():
 
 def main():
     """Main function to start and test LM Studio"""
-    
+
     print("🎯 LM Studio Setup & Test")
     print("=" * 40)
-    
+
     # Start server
     server_started = start_lmstudio_server()
-    
+
     if server_started:
         # Wait a bit for server to start
         print("⏳ Waiting for server to initialize...")
         time.sleep(5)
-        
+
         # Load model
         model_loaded = load_model()
-        
+
         if model_loaded:
             # Wait for model to load
             print("⏳ Waiting for model to load...")
             time.sleep(10)
-            
+
             # Test API
             api_ok = test_api_connection()
-            
+
             if api_ok:
                 print("\n🎉 LM Studio is ready for LEO!")
                 return True
-    
+
     print("\n💡 Manual steps needed:")
     print("1. Open LM Studio GUI")
     print("2. Go to 'Developer' tab")
     print("3. Start local server")
     print("4. Load a model (Llama 3.1 8B recommended)")
     print("5. Run this test again")
-    
+
     return False
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()